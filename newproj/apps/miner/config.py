@@ -1,11 +1,17 @@
 
 import os
+import tempfile
+import threading
 import yaml
 from typing import Any, Dict
 
+# save_config is a read-modify-write of one file; concurrent saves (GUI apply vs close) run one at a time
+_save_lock = threading.Lock()
+
 class Config:
     def __init__(self, data: Dict[str, Any]):
         self.data = data
+        self._parts_cache: Dict[str, tuple] = {}
 
     @classmethod
     def load(cls, path: str = None) -> "Config":
@@ -15,16 +21,28 @@ class Config:
         return cls(data)
 
     def get(self, key_path: str, default=None):
-        parts = key_path.split(".")
+        if "." not in key_path:
+            cur = self.data
+            return cur.get(key_path, default) if isinstance(cur, dict) else default
+        parts = self._parts_cache.get(key_path)
+        if parts is None:
+            parts = self._parts_cache[key_path] = tuple(key_path.split("."))
         cur = self.data
-        for p in parts:
-            if not isinstance(cur, dict) or p not in cur:
-                return default
-            cur = cur[p]
+        try:
+            for p in parts:
+                cur = cur[p]
+        except (KeyError, TypeError):
+            # missing segment, or walked into a non-dict (None/str/list) before the end
+            return default
         return cur
 
 def save_config(new_data: dict, path: str = None):
     cfg_path = path or os.environ.get("SMELLY_CONFIG") or os.path.join("configs", "defaults.yaml")
+    with _save_lock:
+        _save_config_locked(new_data, cfg_path)
+
+
+def _save_config_locked(new_data: dict, cfg_path: str):
     try:
         with open(cfg_path, "r", encoding="utf-8") as f:
             current = yaml.safe_load(f) or {}
@@ -40,9 +58,24 @@ def save_config(new_data: dict, path: str = None):
     if "threads" in new_data:
         current.setdefault("miner", {})["threads"] = new_data["threads"]
 
-    os.makedirs(os.path.dirname(cfg_path), exist_ok=True)
-    with open(cfg_path, "w", encoding="utf-8") as f:
-        yaml.safe_dump(current, f, sort_keys=False)
+    cfg_dir = os.path.dirname(cfg_path) or "."
+    os.makedirs(cfg_dir, exist_ok=True)
+    # Write a sibling temp file and swap it in, so readers never see a truncated config
+    fd, tmp = tempfile.mkstemp(dir=cfg_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            yaml.safe_dump(current, f, sort_keys=False)
+        try:
+            os.chmod(tmp, os.stat(cfg_path).st_mode & 0o777)  # mkstemp is 0600; keep the file's mode
+        except FileNotFoundError:
+            pass
+        os.replace(tmp, cfg_path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
 
 _global_config: Config | None = None
 
@@ -1,9 +1,19 @@
 # gui_core.py
+import array
+import functools
 import threading
 import time
-from typing import Callable, Dict, List
-
-from .solo_miner import get_work, submit_work, build_merkle_root_for_job, header_serialize, pow_hash
+from typing import Callable, Dict, List, Optional
+
+from .solo_miner import (
+    NONCE_CHUNK,
+    NonceAllocator,
+    WorkCache,
+    submit_work_async,
+    build_merkle_root_for_job,
+    header_template,
+    search_slice,
+)
 from .config import get_config
 
 
@@ -19,10 +29,13 @@ class SoloMinerCore:
         self._thread_count = int(self._cfg.get("miner.threads", 4))
         self._poll_ms = 200
         self._slice_ms = 250
+        self._work_cache: Optional[WorkCache] = None
+        self._nonces: Optional[NonceAllocator] = None
 
         self._accepted_blocks = 0
-        self._last_hashes = [0 for _ in range(self._thread_count)]
-        self._hash_lock = threading.Lock()
+        # Written lock-free by workers; _accept_lock only guards the accepted counter
+        self._last_hashes = array.array("Q", [0] * self._thread_count)
+        self._accept_lock = threading.Lock()
 
         # GUI Callbacks
         self.on_log: Callable[[str, str], None] = lambda lvl, msg: None
@@ -37,7 +50,7 @@ class SoloMinerCore:
             self._miner_address = addr
         if threads:
             self._thread_count = int(threads)
-            self._last_hashes = [0 for _ in range(self._thread_count)]
+            self._last_hashes = array.array("Q", [0] * self._thread_count)
 
     def start(self):
         if self._threads:
@@ -46,6 +59,9 @@ class SoloMinerCore:
         self.on_log("info", f"Starting miner with {self._thread_count} threads")
         self.on_status("mining")
         self._stop_evt.clear()
+        self._work_cache = WorkCache(self._miner_address, self._poll_ms)
+        self._nonces = NonceAllocator()
+        self._work_cache.start()
 
         for tid in range(self._thread_count):
             th = threading.Thread(target=self._worker, args=(tid,), daemon=True)
@@ -57,6 +73,8 @@ class SoloMinerCore:
 
     def stop(self, join=False):
         self._stop_evt.set()
+        if self._work_cache is not None:
+            self._work_cache.stop()
         if join:
             for t in self._threads:
                 t.join(timeout=1.0)
@@ -68,61 +86,73 @@ class SoloMinerCore:
         self.start()
 
     def _worker(self, tid: int):
+        cache = self._work_cache
+        nonces = self._nonces
+        job_id = None
         while not self._stop_evt.is_set():
-            work = get_work(self._miner_address)
+            work = cache.get(timeout=self._poll_ms / 1000.0)
             if not work:
-                time.sleep(self._poll_ms / 1000.0)
                 continue
 
-            merkle_root, txids_used = build_merkle_root_for_job(work.height, work.txids)
-            target_int = int(work.target_hex, 16)
-            start = time.time()
-            hashes = 0
-            nonce = tid
-
-            while (time.time() - start) * 1000.0 < self._slice_ms and not self._stop_evt.is_set():
-                hdr_bytes = header_serialize(
+            if work.job_id != job_id:
+                job_id = work.job_id
+                merkle_root, txids_used = build_merkle_root_for_job(work.height, work.txids)
+                target_bytes = int(work.target_hex, 16).to_bytes(32, "big")
+                prefix, suffix = header_template(
                     version=work.version,
                     prev_hash_hex=work.prev_hash,
                     merkle_root_hex=merkle_root,
                     timestamp=work.timestamp,
                     target_hex=work.target_hex,
-                    nonce=nonce,
                     miner_address=self._miner_address,
                     tx_count=len(txids_used),
                 )
-                digest = pow_hash(hdr_bytes, nonce)
-                if int(digest.hex(), 16) <= target_int:
-                    ok, res = submit_work(
-                        job_id=work.job_id,
-                        miner_address=self._miner_address,
-                        nonce=nonce,
-                        version=work.version,
-                        timestamp=work.timestamp,
-                        merkle_root_hex=merkle_root,
-                    )
-                    if ok:
-                        self._accepted_blocks += 1
-                        self.on_log("info", f"[T{tid}] Accepted block {res}")
-                        self.on_accepts(self._accepted_blocks, 0)
-                        break
-                    else:
-                        self.on_log("warn", f"[T{tid}] Submit rejected: {res}")
-                        if res and ("stale" in res or "expired" in res):
-                            break
-                hashes += 1
-                nonce += self._thread_count
-
-            with self._hash_lock:
-                self._last_hashes[tid] = hashes
-
-            time.sleep(self._poll_ms / 1000.0)
+                nonce = end = 0
+            deadline = time.time() + self._slice_ms / 1000.0
+            hashes = 0
+
+            while True:
+                if nonce >= end:
+                    nonce = nonces.reserve(job_id)
+                    end = nonce + NONCE_CHUNK
+                found, nonce, n = search_slice(prefix, suffix, nonce, end, deadline, target_bytes, self._stop_evt)
+                hashes += n
+                if found is None:
+                    if nonce >= end:
+                        continue
+                    break
+                # Keep hashing while the submit is in flight; _on_submitted invalidates work if needed
+                fut = submit_work_async(
+                    job_id=work.job_id,
+                    miner_address=self._miner_address,
+                    nonce=found,
+                    version=work.version,
+                    timestamp=work.timestamp,
+                    merkle_root_hex=merkle_root,
+                )
+                fut.add_done_callback(functools.partial(self._on_submitted, tid, cache))
+
+            self._last_hashes[tid] = hashes
+
+    def _on_submitted(self, tid: int, cache: WorkCache, fut):
+        ok, res = fut.result()
+        if ok:
+            with self._accept_lock:
+                self._accepted_blocks += 1
+                accepted = self._accepted_blocks
+            self.on_log("info", f"[T{tid}] Accepted block {res}")
+            self.on_accepts(accepted, 0)
+            cache.invalidate()
+        else:
+            self.on_log("warn", f"[T{tid}] Submit rejected: {res}")
+            if res and ("stale" in res or "expired" in res):
+                cache.invalidate()
 
     def _reporter_loop(self):
         while not self._stop_evt.is_set():
             time.sleep(2.0)
-            with self._hash_lock:
-                total = sum(self._last_hashes)
-                per = {str(i): float(h) / 2.0 for i, h in enumerate(self._last_hashes)}
-                self._last_hashes = [0 for _ in self._last_hashes]
-            self.on_rates(total / 2.0, per)
+            counts = self._last_hashes.tolist()
+            for i in range(len(counts)):
+                self._last_hashes[i] = 0
+            per = {str(i): float(h) / 2.0 for i, h in enumerate(counts)}
+            self.on_rates(sum(counts) / 2.0, per)
@@ -4,7 +4,6 @@ import sys
 import os
 import time
 import platform
-from datetime import datetime
 from typing import Dict, Any
 
 from PySide6 import QtCore, QtGui, QtWidgets  # type: ignore
@@ -87,6 +86,8 @@ def smelly_palette() -> str:
         background: transparent; border: none; color: {PRIMARY}; padding: 2px 6px;
     }}
     QToolButton:hover {{ color: {ACCENT}; }}
+    QToolButton#navbtn {{ color: {PRIMARY}; background: transparent; border: none; }}
+    QToolButton#navbtn:hover {{ color: {ACCENT}; }}
     /* Inputs: yellow text, yellow border */
     QLineEdit, QSpinBox {{
         background: #070707; color: {PRIMARY}; border: 1px solid {PRIMARY}; padding: 6px 8px; border-radius: 4px;
@@ -111,11 +112,35 @@ def smelly_palette() -> str:
     """
 
 
+_clock_sec = -1
+_clock_txt = "--:--:--"
+
+
+def clock_str() -> str:
+    # HH:MM:SS formatted at most once per second
+    global _clock_sec, _clock_txt
+    now = int(time.time())
+    if now != _clock_sec:
+        lt = time.localtime(now)
+        _clock_txt = f"{lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}"
+        _clock_sec = now
+    return _clock_txt
+
+
+def set_label(lab: QtWidgets.QLabel, text: str):
+    # Skip setText (and the repaint/polish it schedules) when the value is unchanged
+    if lab.text() != text:
+        lab.setText(text)
+
+
 class LogView(QtWidgets.QPlainTextEdit):
     def __init__(self):
         super().__init__()
         self.setReadOnly(True)
-        self.setMaximumBlockCount(5000)
+        # Read-only log: no undo records per appended line, bound applied on the document itself
+        self.setUndoRedoEnabled(False)
+        self.document().setUndoRedoEnabled(False)
+        self.document().setMaximumBlockCount(5000)
         self.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
         self.setWordWrapMode(QtGui.QTextOption.NoWrap)
         monofont = QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont)
@@ -125,7 +150,7 @@ class LogView(QtWidgets.QPlainTextEdit):
     @QtCore.Slot(str, str)
     def append_log(self, level: str, msg: str):
         color = {"info": TEXT, "warn": "#ffae00", "error": "#ff3b3b"}.get(level, TEXT)
-        self.appendHtml(f'<pre style="margin:0;color:{color};">{QtGui.QGuiApplication.translate("log", msg)}</pre>')
+        self.appendHtml(f'<pre style="margin:0;color:{color};">{msg}</pre>')
 
 
 class DashboardTab(QtWidgets.QWidget):
@@ -229,16 +254,16 @@ class DashboardTab(QtWidgets.QWidget):
         self._tick()
 
     def _tick(self):
-        self.labClock.setText(datetime.now().strftime("%H:%M:%S"))
+        set_label(self.labClock, clock_str())
         try:
             cpu = psutil.cpu_percent(interval=None)
             mem = psutil.virtual_memory().percent
-            self.labSys.setText(f"sys: CPU {cpu:.0f}% MEM {mem:.0f}%")
+            set_label(self.labSys, f"sys: CPU {cpu:.0f}% MEM {mem:.0f}%")
         except Exception:
-            self.labSys.setText("sys")
+            set_label(self.labSys, "sys")
 
     def update_rates(self, total: float, per_thread: Dict[str, float]):
-        self.labHashrate.setText(f"{int(total)}")
+        set_label(self.labHashrate, f"{int(total)}")
         # clear and rebuild bars (max 16)
         while self.listBars.count():
             item = self.listBars.takeAt(0)
@@ -368,12 +393,12 @@ class TitleBar(QtWidgets.QWidget):
         lay.addStretch(1)
 
         # Glyphs: triangular minimize, square maximize, X close with even spacing
+        # Styled by the global QSS via the navbtn object name
         def mk_btn(txt: str, w: int = 28) -> QtWidgets.QToolButton:
             b = QtWidgets.QToolButton()
+            b.setObjectName("navbtn")
             b.setCursor(QtCore.Qt.PointingHandCursor)
             b.setFixedSize(w, 20)
-            b.setStyleSheet(f"QToolButton{{color:{PRIMARY}; background:transparent; border:none;}}"
-                            f"QToolButton:hover{{color:{ACCENT};}}")
             b.setText(txt)
             return b
 
@@ -418,6 +443,26 @@ class TitleBar(QtWidgets.QWidget):
         e.accept()
 
 
+class EngineSignals(QtCore.QObject):
+    ready = QtCore.Signal(object)
+    failed = QtCore.Signal(str)
+
+
+class EngineBuildTask(QtCore.QRunnable):
+    def __init__(self, signals: EngineSignals):
+        super().__init__()
+        self.signals = signals
+
+    def run(self):
+        try:
+            core = SoloMinerCore()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        # Queued to the GUI thread since the signals object lives there
+        self.signals.ready.emit(core)
+
+
 class MainWindow(QtWidgets.QMainWindow):
     def __init__(self):
         super().__init__()
@@ -474,8 +519,11 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.setCentralWidget(wrapper)
 
-        # Engine (solo)
-        self.engine = SoloMinerCore()
+        # Engine (solo); built off the GUI thread by load_engine()
+        self.engine: SoloMinerCore | None = None
+        self._engine_signals = EngineSignals(self)
+        self._engine_signals.ready.connect(self._bind_engine)
+        self._engine_signals.failed.connect(self._on_engine_failed)
 
         # wiring
         self.tabDash.startClicked.connect(self._on_start)
@@ -483,14 +531,6 @@ class MainWindow(QtWidgets.QMainWindow):
         self.tabDash.restartClicked.connect(self._on_restart)
         self.tabConfig.applyClicked.connect(self._on_apply_cfg)
 
-        # Bind engine callbacks -> Qt slots via lambdas
-        self.engine.on_log = lambda lvl, msg: self.tabLogs.append_log(lvl, msg)
-        self.engine.on_status = lambda st: self._on_status(st)
-        self.engine.on_rates = lambda total, per: self.tabDash.update_rates(total, {str(k): float(v) for k, v in per.items()})
-        self.engine.on_ticket = lambda t: self._on_ticket(t)
-        self.engine.on_accepts = lambda near, blocks: self._on_accepts(near, blocks)
-        self.engine.on_error = lambda msg: self.tabLogs.append_log("error", msg)
-
         # Window settings
         self._settings = QtCore.QSettings("SMELLY", "SMELLY-Miner-SOLO")
         g = self._settings.value("geometry")
@@ -523,17 +563,54 @@ class MainWindow(QtWidgets.QMainWindow):
             pass
         super().closeEvent(e)
 
+    def load_engine(self):
+        # SoloMinerCore reads config on construction; build it on the pool so first paint isn't blocked
+        QtCore.QThreadPool.globalInstance().start(EngineBuildTask(self._engine_signals))
+
+    @QtCore.Slot(object)
+    def _bind_engine(self, core: SoloMinerCore):
+        self.engine = core
+        # Bind engine callbacks -> Qt slots via lambdas
+        self.engine.on_log = lambda lvl, msg: self.tabLogs.append_log(lvl, msg)
+        self.engine.on_status = lambda st: self._on_status(st)
+        self.engine.on_rates = lambda total, per: self.tabDash.update_rates(total, {str(k): float(v) for k, v in per.items()})
+        self.engine.on_ticket = lambda t: self._on_ticket(t)
+        self.engine.on_accepts = lambda near, blocks: self._on_accepts(near, blocks)
+        self.engine.on_error = lambda msg: self.tabLogs.append_log("error", msg)
+        self._fade_splash()
+
+    @QtCore.Slot(str)
+    def _on_engine_failed(self, msg: str):
+        self.tabLogs.append_log("error", f"miner core failed to load: {msg}")
+        self._fade_splash()
+
+    def _fade_splash(self):
+        sp = getattr(self, "_splash", None)
+        if isinstance(sp, SplashOverlay):
+            sp.fade_out()
+
+    def _engine_ready(self) -> bool:
+        if self.engine is None:
+            self.tabLogs.append_log("warn", "Miner core is still loading")
+            return False
+        return True
+
     def _on_start(self):
-        self.engine.start()
+        if self._engine_ready():
+            self.engine.start()
 
     def _on_stop(self):
-        self.engine.stop()
+        if self._engine_ready():
+            self.engine.stop()
 
     def _on_restart(self):
-        self.engine.restart()
+        if self._engine_ready():
+            self.engine.restart()
 
     def _on_apply_cfg(self, cfg: Dict[str, Any]):
         self.tabLogs.append_log("info", "Configuration saved. Restarting miner...")
+        if not self._engine_ready():
+            return
         try:
             self.engine.set_config(
                 host=cfg.get("host"),
@@ -548,11 +625,11 @@ class MainWindow(QtWidgets.QMainWindow):
 
     @QtCore.Slot(str)
     def _on_status(self, st: str):
-        self.tabDash.labConn.setText(st)
+        set_label(self.tabDash.labConn, st)
 
     @QtCore.Slot(str)
     def _on_backend(self, be: str):
-        self.tabDash.labBackend.setText(be)
+        set_label(self.tabDash.labBackend, be)
 
     # Solo GUI: we don't measure latency; keep method for compatibility (unused)
     @QtCore.Slot(float)
@@ -569,17 +646,17 @@ class MainWindow(QtWidgets.QMainWindow):
             payload = t or {}
             valid_to = int(payload.get("valid_to", 0))
             ttl = max(0, valid_to - int(time.time() * 1000))
-            self.tabDash.labTicket.setText(str(ttl))
-            self.tabDash.labWindow.setText(f"{payload.get('nonce_start', 0)}..+{payload.get('nonce_window', 0)}")
-            self.tabDash.labPrev.setText((payload.get("prev") or "")[:24] + "...")
-            self.tabDash.labTarget.setText((payload.get("target") or "")[:24] + "...")
-            self.tabDash.labVersion.setText(str(payload.get("version", 1)))
+            set_label(self.tabDash.labTicket, str(ttl))
+            set_label(self.tabDash.labWindow, f"{payload.get('nonce_start', 0)}..+{payload.get('nonce_window', 0)}")
+            set_label(self.tabDash.labPrev, (payload.get("prev") or "")[:24] + "...")
+            set_label(self.tabDash.labTarget, (payload.get("target") or "")[:24] + "...")
+            set_label(self.tabDash.labVersion, str(payload.get("version", 1)))
         except Exception:
             pass
 
     def _on_accepts(self, near: int, blocks: int):
-        self.tabDash.labNear.setText(str(near))
-        self.tabDash.labBlocks.setText(str(blocks))
+        set_label(self.tabDash.labNear, str(near))
+        set_label(self.tabDash.labBlocks, str(blocks))
 
     @QtCore.Slot(str)
     def _on_error(self, msg: str):
@@ -711,6 +788,7 @@ def launch_gui():
     slogan = SLOGANS[QtCore.QRandomGenerator.global_().bounded(len(SLOGANS))]
     print("[SMELLY-GUI] Chosen slogan:", slogan, flush=True)
     win = MainWindow()
+    win.load_engine()
     print("[SMELLY-GUI] MainWindow created", flush=True)
     # footer label across all tabs
     footer = QtWidgets.QLabel(f"SMELLYCOIN — {slogan}")
@@ -721,13 +799,6 @@ def launch_gui():
     win.statusBar().addPermanentWidget(footer, 1)
     win.show()
     print("[SMELLY-GUI] Window shown", flush=True)
-    # Safety: ensure fade after 2s if still visible (single-shot, guarded inside SplashOverlay)
-    def _safety():
-        print("[SMELLY-GUI] Safety timer firing (2s)", flush=True)
-        sp = getattr(win, "_splash", None)
-        if isinstance(sp, SplashOverlay):
-            sp.fade_out()
-    QtCore.QTimer.singleShot(2000, _safety)
     return app.exec()
 
 # Allow module execution via `python -m apps.miner.smelly_gui`
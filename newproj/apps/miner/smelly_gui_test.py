@@ -8,7 +8,6 @@ import os
 
 import time
 import platform
-from datetime import datetime
 from typing import Dict, Any
 import json
 
@@ -45,6 +44,9 @@ SLOGANS = [
     "easy for all"
 ]
 
+# Miner fields mirrored into QSettings; miner_config.json stays the canonical store
+MINER_SETTINGS_KEYS = ("host", "port", "addr", "threads")
+
 CAMERON_QUOTES = [
     "Cameron makes everything warmer. I Love you, Cameron.",
     "Everything's better with Cameron in it.",
@@ -108,6 +110,8 @@ def smelly_palette() -> str:
         background: transparent; border: none; color: {PRIMARY}; padding: 2px 6px;
     }}
     QToolButton:hover {{ color: {ACCENT}; }}
+    QToolButton#navbtn {{ color: {PRIMARY}; background: transparent; border: none; }}
+    QToolButton#navbtn:hover {{ color: {ACCENT}; }}
 
     QLineEdit, QSpinBox {{
         background: #070707; color: {PRIMARY}; border: 1px solid {PRIMARY}; padding: 6px 8px; border-radius: 4px;
@@ -129,11 +133,35 @@ def smelly_palette() -> str:
     QStatusBar {{ background: {CARD}; color: {AMBER}; border-top: 1px solid {BORDER}; }}
     """
 
+_clock_sec = -1
+_clock_txt = "--:--:--"
+
+
+def clock_str() -> str:
+    # HH:MM:SS formatted at most once per second; shared by the dash clock and log stamps
+    global _clock_sec, _clock_txt
+    now = int(time.time())
+    if now != _clock_sec:
+        lt = time.localtime(now)
+        _clock_txt = f"{lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}"
+        _clock_sec = now
+    return _clock_txt
+
+
+def set_label(lab: QtWidgets.QLabel, text: str):
+    # Skip setText (and the repaint/polish it schedules) when the value is unchanged
+    if lab.text() != text:
+        lab.setText(text)
+
+
 class LogView(QtWidgets.QPlainTextEdit):
     def __init__(self):
         super().__init__()
         self.setReadOnly(True)
-        self.setMaximumBlockCount(5000)
+        # Read-only log: no undo records per appended line, bound applied on the document itself
+        self.setUndoRedoEnabled(False)
+        self.document().setUndoRedoEnabled(False)
+        self.document().setMaximumBlockCount(5000)
         self.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
         self.setWordWrapMode(QtGui.QTextOption.NoWrap)
         monofont = QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont)
@@ -143,8 +171,7 @@ class LogView(QtWidgets.QPlainTextEdit):
     @QtCore.Slot(str, str)
     def append_log(self, level: str, msg: str):
         color = {"info": TEXT, "warn": "#ffae00", "error": "#ff3b3b"}.get(level, TEXT)
-        stamp = datetime.now().strftime("%H:%M:%S")
-        self.appendHtml(f'<pre style="margin:0;color:{color};">[{stamp}] {QtGui.QGuiApplication.translate("log", msg)}</pre>')
+        self.appendHtml(f'<pre style="margin:0;color:{color};">[{clock_str()}] {msg}</pre>')
 
 
 class DashboardTab(QtWidgets.QWidget):
@@ -249,16 +276,16 @@ class DashboardTab(QtWidgets.QWidget):
         self._tick()
 
     def _tick(self):
-        self.labClock.setText(datetime.now().strftime("%H:%M:%S"))
+        set_label(self.labClock, clock_str())
         try:
             cpu = psutil.cpu_percent(interval=None)
             mem = psutil.virtual_memory().percent
-            self.labSys.setText(f"sys: CPU {cpu:.0f}% MEM {mem:.0f}%")
+            set_label(self.labSys, f"sys: CPU {cpu:.0f}% MEM {mem:.0f}%")
         except Exception:
-            self.labSys.setText("sys")
+            set_label(self.labSys, "sys")
 
     def update_rates(self, total: float, per_thread: Dict[str, float]):
-        self.labHashrate.setText(f"{int(total)}")
+        set_label(self.labHashrate, f"{int(total)}")
         # clear and rebuild bars (max 16)
         while self.listBars.count():
             item = self.listBars.takeAt(0)
@@ -336,12 +363,20 @@ class ConfigTab(QtWidgets.QWidget):
             "addr": self.inAddress.text().strip() or "SMELLY_SOLO",
             "threads": int(self.inThreads.value()),
         }
-        # Save to disk
+        self.applyClicked.emit(cfg)
+
+
+class ConfigSaveTask(QtCore.QRunnable):
+    """Persist the miner config on a pool thread so disk I/O never blocks the GUI loop."""
+    def __init__(self, cfg: Dict[str, Any]):
+        super().__init__()
+        self.cfg = dict(cfg)
+
+    def run(self):
         try:
-            save_config(cfg)
+            save_config(self.cfg)
         except Exception as e:
             print("save_config failed:", e)
-        self.applyClicked.emit(cfg)
 
 
 class ChainTab(QtWidgets.QWidget):
@@ -393,27 +428,17 @@ class TitleBar(QtWidgets.QWidget):
         lay.addWidget(self.title)
         lay.addStretch(1)
 
-        # Nav arrows to switch tabs
-        def mk_nav(txt: str):
-            b = QtWidgets.QToolButton()
-            b.setCursor(QtCore.Qt.PointingHandCursor)
-            b.setFixedSize(28, 20)
-            b.setText(txt)
-            b.setStyleSheet(f"QToolButton{{color:{PRIMARY};}} QToolButton:hover{{color:{ACCENT};}}")
-            return b
-
-        self.btnPrev = mk_nav("▲")
-        self.btnNext = mk_nav("▼")
-
-        # Window control glyphs
+        # Nav arrows and window control glyphs; styled by the global QSS via the navbtn object name
         def mk_btn(txt: str):
             b = QtWidgets.QToolButton()
+            b.setObjectName("navbtn")
             b.setCursor(QtCore.Qt.PointingHandCursor)
             b.setFixedSize(28, 20)
             b.setText(txt)
-            b.setStyleSheet(f"QToolButton{{color:{PRIMARY};}} QToolButton:hover{{color:{ACCENT};}}")
             return b
 
+        self.btnPrev = mk_btn("▲")
+        self.btnNext = mk_btn("▼")
         self.btnMin = mk_btn("▾")
         self.btnMax = mk_btn("▢")
         self.btnClose = mk_btn("✖")
@@ -470,6 +495,26 @@ class TitleBar(QtWidgets.QWidget):
         e.accept()
 
 
+class EngineSignals(QtCore.QObject):
+    ready = QtCore.Signal(object)
+    failed = QtCore.Signal(str)
+
+
+class EngineBuildTask(QtCore.QRunnable):
+    def __init__(self, signals: EngineSignals):
+        super().__init__()
+        self.signals = signals
+
+    def run(self):
+        try:
+            core = SoloMinerCore()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        # Queued to the GUI thread since the signals object lives there
+        self.signals.ready.emit(core)
+
+
 class MainWindow(QtWidgets.QMainWindow):
     def __init__(self):
         super().__init__()
@@ -499,14 +544,12 @@ class MainWindow(QtWidgets.QMainWindow):
         content_lay.setContentsMargins(16, 14, 16, 16)
         content_lay.setSpacing(14)
 
-        # Defaults from config (read from miner_config.json)
-        cfg = get_config()
-        defaults = {
-            "host": cfg.get("network", {}).get("rpc_host", "127.0.0.1"),
-            "port": int(cfg.get("network", {}).get("rpc_port", 28445)),
-            "addr": cfg.get("miner", {}).get("default_address", "SMELLY_SOLO"),
-            "threads": int(cfg.get("miner", {}).get("threads", 4)),
-        }
+        # Window settings; also mirrors the hot miner fields so startup skips the config file
+        self._settings = QtCore.QSettings("SMELLY", "SMELLY-Miner-SOLO")
+        defaults = self._load_defaults()
+        # Config file writes run here, one at a time and in order; closeEvent drains it before exit
+        self._save_pool = QtCore.QThreadPool(self)
+        self._save_pool.setMaxThreadCount(1)
 
         # Tabs
         self.tabs = QtWidgets.QTabWidget()
@@ -530,9 +573,11 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.setCentralWidget(wrapper)
 
-        # Engine (solo)
-        self.engine = SoloMinerCore()
-
+        # Engine (solo); built off the GUI thread by load_engine()
+        self.engine: SoloMinerCore | None = None
+        self._engine_signals = EngineSignals(self)
+        self._engine_signals.ready.connect(self._bind_engine)
+        self._engine_signals.failed.connect(self._on_engine_failed)
 
         # wiring
         self.tabDash.startClicked.connect(self._on_start)
@@ -540,16 +585,6 @@ class MainWindow(QtWidgets.QMainWindow):
         self.tabDash.restartClicked.connect(self._on_restart)
         self.tabConfig.applyClicked.connect(self._on_apply_cfg)
 
-        # Bind engine callbacks -> Qt slots via lambdas
-        self.engine.on_log = lambda lvl, msg: self.tabLogs.append_log(lvl, msg)
-        self.engine.on_status = lambda st: self._on_status(st)
-        self.engine.on_rates = lambda total, per: self.tabDash.update_rates(total, {str(k): float(v) for k, v in per.items()})
-        self.engine.on_ticket = lambda t: self._on_ticket(t)
-        self.engine.on_accepts = lambda near, blocks: self._on_accepts(near, blocks)
-        self.engine.on_error = lambda msg: self.tabLogs.append_log("error", msg)
-
-        # Window settings
-        self._settings = QtCore.QSettings("SMELLY", "SMELLY-Miner-SOLO")
         g = self._settings.value("geometry")
         if g:
             try:
@@ -582,7 +617,7 @@ class MainWindow(QtWidgets.QMainWindow):
             self.engine.stop(join=True)
         except Exception:
             pass
-        # Save latest GUI config to disk (so next run picks up)
+        # Save latest GUI config (so next run picks up), then wait for every queued write to land
         try:
             cfg = {
                 "host": self.tabConfig.inHost.text().strip() or "127.0.0.1",
@@ -590,22 +625,87 @@ class MainWindow(QtWidgets.QMainWindow):
                 "addr": self.tabConfig.inAddress.text().strip() or "SMELLY_SOLO",
                 "threads": int(self.tabConfig.inThreads.value()),
             }
-            save_config(cfg)
+            self._store_config(cfg)
         except Exception:
             pass
+        self._save_pool.waitForDone()
         super().closeEvent(e)
 
+    def _load_defaults(self) -> Dict[str, Any]:
+        s = self._settings
+        if all(s.contains(f"miner/{k}") for k in MINER_SETTINGS_KEYS):
+            try:
+                return {
+                    "host": str(s.value("miner/host")),
+                    "port": int(s.value("miner/port")),
+                    "addr": str(s.value("miner/addr")),
+                    "threads": int(s.value("miner/threads")),
+                }
+            except (TypeError, ValueError):
+                pass
+        # First run (or corrupt settings): fall back to miner_config.json
+        cfg = get_config()
+        return {
+            "host": cfg.get("network", {}).get("rpc_host", "127.0.0.1"),
+            "port": int(cfg.get("network", {}).get("rpc_port", 28445)),
+            "addr": cfg.get("miner", {}).get("default_address", "SMELLY_SOLO"),
+            "threads": int(cfg.get("miner", {}).get("threads", 4)),
+        }
+
+    def _store_config(self, cfg: Dict[str, Any]):
+        for k in MINER_SETTINGS_KEYS:
+            self._settings.setValue(f"miner/{k}", cfg[k])
+        self._save_pool.start(ConfigSaveTask(cfg))
+
+    def load_engine(self):
+        # SoloMinerCore reads config on construction; build it on the pool so first paint isn't blocked
+        QtCore.QThreadPool.globalInstance().start(EngineBuildTask(self._engine_signals))
+
+    @QtCore.Slot(object)
+    def _bind_engine(self, core: SoloMinerCore):
+        self.engine = core
+        # Bind engine callbacks -> Qt slots via lambdas
+        self.engine.on_log = lambda lvl, msg: self.tabLogs.append_log(lvl, msg)
+        self.engine.on_status = lambda st: self._on_status(st)
+        self.engine.on_rates = lambda total, per: self.tabDash.update_rates(total, {str(k): float(v) for k, v in per.items()})
+        self.engine.on_ticket = lambda t: self._on_ticket(t)
+        self.engine.on_accepts = lambda near, blocks: self._on_accepts(near, blocks)
+        self.engine.on_error = lambda msg: self.tabLogs.append_log("error", msg)
+        self._fade_splash()
+
+    @QtCore.Slot(str)
+    def _on_engine_failed(self, msg: str):
+        self.tabLogs.append_log("error", f"miner core failed to load: {msg}")
+        self._fade_splash()
+
+    def _fade_splash(self):
+        sp = getattr(self, "_splash", None)
+        if isinstance(sp, SplashOverlay):
+            sp.fade_out()
+
+    def _engine_ready(self) -> bool:
+        if self.engine is None:
+            self.tabLogs.append_log("warn", "Miner core is still loading")
+            return False
+        return True
+
     def _on_start(self):
-        self.engine.start()
+        if self._engine_ready():
+            self.engine.start()
 
     def _on_stop(self):
-        self.engine.stop()
+        if self._engine_ready():
+            self.engine.stop()
 
     def _on_restart(self):
-        self.engine.restart()
+        if self._engine_ready():
+            self.engine.restart()
 
     def _on_apply_cfg(self, cfg: Dict[str, Any]):
+        self._store_config(cfg)
         self.tabLogs.append_log("info", "Configuration saved. Restarting miner...")
+        if not self._engine_ready():
+            return
         try:
             self.engine.set_config(
                 host=cfg.get("host"),
@@ -620,9 +720,9 @@ class MainWindow(QtWidgets.QMainWindow):
 
     @QtCore.Slot(str)
     def _on_status(self, st: str):
-        self.tabDash.labConn.setText(st)
+        set_label(self.tabDash.labConn, st)
         # update backend label too
-        self.tabDash.labBackend.setText("argon2id")
+        set_label(self.tabDash.labBackend, "argon2id")
 
     # Solo GUI: keep method for compatibility
     @QtCore.Slot(float)
@@ -638,17 +738,17 @@ class MainWindow(QtWidgets.QMainWindow):
             payload = t or {}
             valid_to = int(payload.get("valid_to", 0))
             ttl = max(0, valid_to - int(time.time() * 1000))
-            self.tabDash.labTicket.setText(str(ttl))
-            self.tabDash.labWindow.setText(f"{payload.get('nonce_start', 0)}..+{payload.get('nonce_window', 0)}")
-            self.tabDash.labPrev.setText((payload.get("prev") or "")[:24] + "...")
-            self.tabDash.labTarget.setText((payload.get("target") or "")[:24] + "...")
-            self.tabDash.labVersion.setText(str(payload.get("version", 1)))
+            set_label(self.tabDash.labTicket, str(ttl))
+            set_label(self.tabDash.labWindow, f"{payload.get('nonce_start', 0)}..+{payload.get('nonce_window', 0)}")
+            set_label(self.tabDash.labPrev, (payload.get("prev") or "")[:24] + "...")
+            set_label(self.tabDash.labTarget, (payload.get("target") or "")[:24] + "...")
+            set_label(self.tabDash.labVersion, str(payload.get("version", 1)))
         except Exception:
             pass
 
     def _on_accepts(self, near: int, blocks: int):
-        self.tabDash.labNear.setText(str(near))
-        self.tabDash.labBlocks.setText(str(blocks))
+        set_label(self.tabDash.labNear, str(near))
+        set_label(self.tabDash.labBlocks, str(blocks))
 
     @QtCore.Slot(str)
     def _on_error(self, msg: str):
@@ -771,6 +871,7 @@ def launch_gui():
 
     slogan = SLOGANS[QtCore.QRandomGenerator.global_().bounded(len(SLOGANS))]
     win = MainWindow()
+    win.load_engine()
     footer = QtWidgets.QLabel(f"SMELLYCOIN — {slogan}")
     footer.setStyleSheet(f"color:{AMBER}; padding:6px 8px; background:{CARD};")
     footer.setAlignment(QtCore.Qt.AlignCenter)
@@ -782,13 +883,6 @@ def launch_gui():
     cam_label.setStyleSheet("padding:6px; color: #ffd0d0;")
     win.statusBar().addPermanentWidget(cam_label, 0)
     win.show()
-
-    # ensure splash fades if still visible
-    def _safety():
-        sp = getattr(win, "_splash", None)
-        if isinstance(sp, SplashOverlay):
-            sp.fade_out()
-    QtCore.QTimer.singleShot(2000, _safety)
     return app.exec()
 
 if __name__ == "__main__":
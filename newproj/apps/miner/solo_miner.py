@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import argparse
+import array
+import functools
 import os
 import threading
 import time
@@ -8,13 +10,23 @@ import json
 import math
 import queue
 import requests
+from requests.adapters import HTTPAdapter
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Optional, List, Tuple
 
 from core.config import get_config
+from core.utils import sha3_256_hex, sha3_256_level
 from core.pow.randomx_stub import pow_hash
 
 
+# Shared keep-alive pool for node RPC; every worker thread reuses these connections
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=32, pool_maxsize=64))
+_SESSION.headers["Connection"] = "keep-alive"
+
+
 def rpc_url() -> str:
     cfg = get_config()
     return f"http://{cfg.get('network.rpc_host','127.0.0.1')}:{cfg.get('network.rpc_port',28445)}"
@@ -22,7 +34,7 @@ def rpc_url() -> str:
 
 # -------- Legacy single-shot (server mines) --------
 def mine_one(miner_address: str, timeout_sec: int = 25) -> Optional[str]:
-    r = requests.post(
+    r = _SESSION.post(
         f"{rpc_url()}/rpc/mine_one",
         json={"miner_address": miner_address},
         timeout=timeout_sec
@@ -47,7 +59,7 @@ class Work:
 
 def get_work(miner_address: Optional[str]) -> Optional[Work]:
     try:
-        r = requests.post(
+        r = _SESSION.post(
             f"{rpc_url()}/rpc/get_work",
             json={"miner_address": miner_address} if miner_address else {},
             timeout=10,
@@ -69,9 +81,62 @@ def get_work(miner_address: Optional[str]) -> Optional[Work]:
         return None
 
 
+class WorkCache:
+    """
+    Latest Work shared by all mining threads. A single fetcher thread polls get_work
+    every poll_ms, so RPC volume no longer scales with the thread count.
+    """
+    def __init__(self, miner_address: Optional[str], poll_ms: int):
+        self.miner_address = miner_address
+        self.poll_ms = poll_ms
+        self._work: Optional[Work] = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._wake = threading.Event()
+        self._stop_evt = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._stop_evt.clear()
+        self._thread = threading.Thread(target=self._work_refresher, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_evt.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def get(self, timeout: float) -> Optional[Work]:
+        # Blocks until work is available (or timeout); returns the current Work or None
+        self._ready.wait(timeout)
+        with self._lock:
+            return self._work
+
+    def invalidate(self):
+        # Job accepted or went stale: drop it and fetch a fresh one right away
+        with self._lock:
+            self._work = None
+            self._ready.clear()
+        self._wake.set()
+
+    def _work_refresher(self):
+        while not self._stop_evt.is_set():
+            w = get_work(self.miner_address)
+            with self._lock:
+                self._work = w
+                if w is not None:
+                    self._ready.set()
+                else:
+                    self._ready.clear()
+            self._wake.wait(max(0.1, self.poll_ms / 1000.0))
+            self._wake.clear()
+
+
 def submit_work(job_id: str, miner_address: str, nonce: int, version: int, timestamp: int, merkle_root_hex: str) -> Tuple[bool, Optional[str]]:
     try:
-        r = requests.post(
+        r = _SESSION.post(
             f"{rpc_url()}/rpc/submit_work",
             json={
                 "job_id": job_id,
@@ -103,118 +168,190 @@ def submit_work(job_id: str, miner_address: str, nonce: int, version: int, times
         return False, str(e)
 
 
+# Submits run here over _SESSION's pooled keep-alive connections so hashing threads never block on the node
+_SUBMIT_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="submit_work")
+
+
+def submit_work_async(**kwargs) -> Future:
+    # Same arguments as submit_work(); the future resolves to its (ok, result) tuple
+    return _SUBMIT_POOL.submit(submit_work, **kwargs)
+
+
+# Byte-for-byte the compact json.dumps of consensus.Header.serialize()'s field list, split at the nonce
+_HDR_HEAD = b'[["version",%d],["prev_hash_hex",%s],["merkle_root_hex",%s],["timestamp",%d],["target",%s],["nonce",'
+_HDR_TAIL = b'],["miner_address",%s],["tx_count",%d]]'
+# Same quoting/escaping json.dumps applies to str values (ensure_ascii=True)
+_json_str = json.encoder.encode_basestring_ascii
+
+
+def header_template(version: int, prev_hash_hex: str, merkle_root_hex: str, timestamp: int, target_hex: str, miner_address: str, tx_count: int) -> Tuple[bytes, bytes]:
+    # Serialized header split around the nonce digits: prefix + b"%d" % nonce + suffix == header_serialize(...)
+    prefix = _HDR_HEAD % (
+        version,
+        _json_str(prev_hash_hex).encode("ascii"),
+        _json_str(merkle_root_hex).encode("ascii"),
+        timestamp,
+        _json_str(target_hex).encode("ascii"),
+    )
+    suffix = _HDR_TAIL % (_json_str(miner_address).encode("ascii"), tx_count)
+    return prefix, suffix
+
+
 def header_serialize(version: int, prev_hash_hex: str, merkle_root_hex: str, timestamp: int, target_hex: str, nonce: int, miner_address: str, tx_count: int) -> bytes:
     # Must match consensus.Header.serialize()
-    fields = [
-        ("version", version),
-        ("prev_hash_hex", prev_hash_hex),
-        ("merkle_root_hex", merkle_root_hex),
-        ("timestamp", timestamp),
-        ("target", target_hex),
-        ("nonce", nonce),
-        ("miner_address", miner_address),
-        ("tx_count", tx_count),
-    ]
-    return json.dumps(fields, separators=(",", ":"), sort_keys=False).encode("utf-8")
+    prefix, suffix = header_template(version, prev_hash_hex, merkle_root_hex, timestamp, target_hex, miner_address, tx_count)
+    return prefix + b"%d" % nonce + suffix
+
+
+NONCE_CHUNK = 4096
+
+
+class NonceAllocator:
+    """
+    Hands out disjoint [start, start + NONCE_CHUNK) nonce ranges per job to worker threads,
+    so a slow thread never leaves a gap in, or duplicates, another thread's range.
+    """
+    def __init__(self, keep_jobs: int = 8):
+        self._lock = threading.Lock()
+        self._next: "OrderedDict[str, int]" = OrderedDict()
+        self._keep_jobs = keep_jobs
+
+    def reserve(self, job_id: str) -> int:
+        with self._lock:
+            start = self._next.get(job_id, 0)
+            self._next[job_id] = start + NONCE_CHUNK
+            self._next.move_to_end(job_id)
+            if len(self._next) > self._keep_jobs:
+                self._next.popitem(last=False)
+            return start
+
+
+def search_slice(prefix: bytes, suffix: bytes, nonce: int, end: int, deadline: float, target_bytes: bytes, stop_evt: threading.Event) -> Tuple[Optional[int], int, int]:
+    # Hash nonce, nonce+1, ... (< end) until one meets the target or the deadline/stop hits.
+    # Digests and target are both 32-byte big-endian, so bytes ordering == integer ordering.
+    # Returns (found_nonce or None, next_nonce, hashes_done); next_nonce == end means the range is used up.
+    hash_fn = pow_hash
+    clock = time.time
+    stopped = stop_evt.is_set
+    hashes = 0
+    while nonce < end and clock() < deadline and not stopped():
+        h = hash_fn(prefix + b"%d" % nonce + suffix, nonce)
+        hashes += 1
+        if h <= target_bytes:
+            return nonce, nonce + 1, hashes
+        nonce += 1
+    return None, nonce, hashes
 
 
 def merkle_root_from_txids(txids: List[str]) -> str:
-    # Must match consensus.merkle_root_hex()
-    import hashlib
-    def sha3_256_hex(b: bytes) -> str:
-        return hashlib.sha3_256(b).hexdigest()
+    # Must match consensus.calc_merkle_root(); nodes stay raw digests until the root
     if not txids:
         return sha3_256_hex(b"")
     layer = [bytes.fromhex(t) for t in txids]
     while len(layer) > 1:
-        nxt = []
         if len(layer) % 2 == 1:
             layer.append(layer[-1])
-        for i in range(0, len(layer), 2):
-            nxt.append(bytes.fromhex(sha3_256_hex(layer[i] + layer[i + 1])))
-        layer = nxt
+        layer = sha3_256_level(layer)
     return layer[0].hex()
 
 
+@functools.lru_cache(maxsize=16)
 def coinbase_txid_for_height(height: int) -> str:
-    import hashlib
-    return hashlib.sha3_256(f"COINBASE:{height}".encode("utf-8")).hexdigest()
+    return sha3_256_hex(f"COINBASE:{height}".encode("utf-8"))
+
+
+@functools.lru_cache(maxsize=8)
+def _merkle_cached(height: int, snapshot_txids: Tuple[str, ...]) -> Tuple[str, Tuple[str, ...]]:
+    # coinbase first, then snapshot txids; deterministic in (height, txids) so safe to share across slices/threads
+    txids = (coinbase_txid_for_height(height),) + snapshot_txids
+    return merkle_root_from_txids(list(txids)), txids
 
 
 def build_merkle_root_for_job(height: int, snapshot_txids: List[str]) -> Tuple[str, List[str]]:
-    # coinbase first, then snapshot txids
-    txids = [coinbase_txid_for_height(height)] + list(snapshot_txids or [])
-    return merkle_root_from_txids(txids), txids
+    mr, txids = _merkle_cached(height, tuple(snapshot_txids or ()))
+    return mr, list(txids)
 
 
 def mine_client_side(miner_address: str, threads: int, slice_ms: int, poll_ms: int):
     print(f"Client miner starting: threads={threads}, slice_ms={slice_ms}, poll_ms={poll_ms}")
     stop_evt = threading.Event()
+    # Per-thread hash counters are written without locking; a lost update only skews one 2 s readout.
+    # The lock guards accepted_total alone.
     stats_lock = threading.Lock()
-    last_hashes = [0 for _ in range(threads)]
+    last_hashes = array.array("Q", [0] * max(1, threads))
     accepted_total = 0
+    cache = WorkCache(miner_address, poll_ms)
+    nonces = NonceAllocator()
 
-    def worker(tid: int):
+    def on_submitted(tid: int, found: int, fut: Future):
         nonlocal accepted_total
+        ok, res = fut.result()
+        if ok:
+            with stats_lock:
+                accepted_total += 1
+            print(f"[T{tid}] ACCEPTED block {res} at nonce={found}")
+            # after acceptance, fetch new work
+            cache.invalidate()
+        elif res and ("stale" in res or "stale-prev" in res or "expired" in res):
+            # If stale, refresh work immediately
+            print(f"[T{tid}] submit stale: {res}")
+            cache.invalidate()
+        else:
+            print(f"[T{tid}] submit rejected: {res}")
+
+    def worker(tid: int):
         rng = 0
+        job_id = None
         while not stop_evt.is_set():
-            # Get or refresh work
-            w = get_work(miner_address)
+            # Current work from the shared cache (refreshed by one fetcher thread)
+            w = cache.get(timeout=max(0.1, poll_ms / 1000.0))
             if not w:
-                time.sleep(max(0.1, poll_ms / 1000.0))
                 continue
 
-            mr, txids_used = build_merkle_root_for_job(w.height, w.txids)
-            target_int = int(w.target_hex, 16)
-            start = time.time()
-            hashes = 0
-            # thread-specific stride: try nonces tid, tid+threads, tid+2*threads...
-            nonce = tid
-            while (time.time() - start) * 1000.0 < slice_ms and not stop_evt.is_set():
-                # Construct header JSON matching server format
-                hdr_bytes = header_serialize(
+            if w.job_id != job_id:
+                job_id = w.job_id
+                mr, txids_used = build_merkle_root_for_job(w.height, w.txids)
+                target_bytes = int(w.target_hex, 16).to_bytes(32, "big")
+                # Header JSON matching server format, serialized once per job; only the nonce digits change
+                prefix, suffix = header_template(
                     version=w.version,
                     prev_hash_hex=w.prev_hash,
                     merkle_root_hex=mr,
-                    timestamp=w.timestamp,  # static for this slice; server accepts submitted timestamp
+                    timestamp=w.timestamp,  # static for this job; server accepts submitted timestamp
                     target_hex=w.target_hex,
-                    nonce=nonce,
                     miner_address=miner_address,
                     tx_count=len(txids_used),
                 )
-                h = pow_hash(hdr_bytes, nonce)
-                if int(h.hex(), 16) <= target_int:
-                    ok, res = submit_work(
-                        job_id=w.job_id,
-                        miner_address=miner_address,
-                        nonce=nonce,
-                        version=w.version,
-                        timestamp=w.timestamp,
-                        merkle_root_hex=mr,
-                    )
-                    if ok:
-                        with stats_lock:
-                            accepted_total += 1
-                        print(f"[T{tid}] ACCEPTED block {res} at nonce={nonce}")
-                        # after acceptance, fetch new work
-                        break
-                    else:
-                        # If stale, break slice and refresh work immediately
-                        if res and ("stale" in res or "stale-prev" in res or "expired" in res):
-                            print(f"[T{tid}] submit stale: {res}")
-                            break
-                        else:
-                            print(f"[T{tid}] submit rejected: {res}")
-                hashes += 1
-                nonce += threads
+                # nonce ranges come from the shared allocator, one chunk at a time
+                nonce = end = 0
+            deadline = time.time() + slice_ms / 1000.0
+            hashes = 0
+            while True:
+                if nonce >= end:
+                    nonce = nonces.reserve(job_id)
+                    end = nonce + NONCE_CHUNK
+                found, nonce, n = search_slice(prefix, suffix, nonce, end, deadline, target_bytes, stop_evt)
+                hashes += n
+                if found is None:
+                    if nonce >= end:
+                        continue
+                    break
+                # Keep hashing while the submit is in flight; the callback invalidates work if needed
+                fut = submit_work_async(
+                    job_id=w.job_id,
+                    miner_address=miner_address,
+                    nonce=found,
+                    version=w.version,
+                    timestamp=w.timestamp,
+                    merkle_root_hex=mr,
+                )
+                fut.add_done_callback(functools.partial(on_submitted, tid, found))
 
-            with stats_lock:
-                last_hashes[tid] = hashes
-            # short pause before next slice
-            time.sleep(max(0.0, poll_ms / 1000.0))
+            last_hashes[tid] = hashes
 
     # Launch workers
     threads = max(1, threads)
+    cache.start()
     ths: List[threading.Thread] = []
     for i in range(threads):
         t = threading.Thread(target=worker, args=(i,), daemon=True)
@@ -225,15 +362,17 @@ def mine_client_side(miner_address: str, threads: int, slice_ms: int, poll_ms: i
         last_t = time.time()
         while True:
             time.sleep(2.0)
+            per = last_hashes.tolist()
+            # reset counters for next interval measurement
+            for i in range(len(last_hashes)):
+                last_hashes[i] = 0
             with stats_lock:
-                total_h = sum(last_hashes)
-                print(f"Hashrate ~ {total_h/2.0:.0f} H/s | accepted={accepted_total} | per-thread={last_hashes}")
-                # reset counters for next interval measurement
-                for i in range(len(last_hashes)):
-                    last_hashes[i] = 0
+                acc = accepted_total
+            print(f"Hashrate ~ {sum(per)/2.0:.0f} H/s | accepted={acc} | per-thread={per}")
     except KeyboardInterrupt:
         print("Stopping miner...")
         stop_evt.set()
+        cache.stop()
         for t in ths:
             t.join(timeout=1.0)
 
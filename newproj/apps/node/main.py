@@ -4,7 +4,10 @@ import time
 import requests
 import socket
 import json
-from typing import Dict, Set, Tuple, List
+from collections import OrderedDict
+from typing import Dict, Set, Tuple, List, Optional
+
+import orjson
 
 from core.rpc import run_rpc_server
 from core.config import get_config
@@ -20,27 +23,197 @@ from core.consensus import (
 from core.pow.randomx_stub import difficulty_to_target
 
 
-# ----------------- P2P (JSON line protocol: VERSION/VERACK, INV, GETDATA, BLOCKHDR, TX, PING/PONG) -----------------
+# ----------------- P2P (length-prefixed JSON frames: VERSION/VERACK, INV, GETDATA, BLOCKHDR, TX, PING/PONG) -----------------
+# Each frame is a 4-byte big-endian payload length followed by the orjson-encoded message.
+
+_P2P_MAX_FRAME = 8 * 1024 * 1024
 
 class PeerState:
-    def __init__(self, addr: str, fp):
+    def __init__(self, addr: str, sock: socket.socket):
         self.addr = addr
-        self.fp = fp
+        self.sock = sock
+        # Serve thread and broadcasters both write; keep each batch's frames contiguous
+        self.send_lock = threading.Lock()
         self.last_seen = now_ms()
 
 
-_seen_hdr: Set[str] = set()
-_seen_tx: Set[str] = set()
+class SeenSet:
+    """Bounded set of recently seen hashes; evicts least recently added/checked entries past maxlen."""
+    def __init__(self, maxlen: int):
+        self.maxlen = maxlen
+        self._items: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, key: str):
+        with self._lock:
+            self._items[key] = None
+            self._items.move_to_end(key)
+            if len(self._items) > self.maxlen:
+                self._items.popitem(last=False)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return True
+            return False
+
+
+_seen_hdr = SeenSet(100_000)
+_seen_tx = SeenSet(200_000)
 _peers: Dict[str, PeerState] = {}  # addr -> state
 _peers_lock = threading.Lock()
+# Immutable copy of _peers.values() rebuilt on every add/remove; fanout reads it without the lock
+_peers_snapshot: Tuple[PeerState, ...] = ()
+# hash -> ready-to-send BLOCKHDR frame; headers are immutable by hash so entries are never invalidated
+_HDR_BLOB_CACHE_MAX = 128
+_hdr_blob_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_hdr_blob_lock = threading.Lock()
+
+
+def _add_peer(addr: str, ps: PeerState):
+    global _peers_snapshot
+    with _peers_lock:
+        _peers[addr] = ps
+        _peers_snapshot = tuple(_peers.values())
+
+
+def _remove_peer(ps: PeerState):
+    _remove_peers((ps,))
+
+
+def _remove_peers(states):
+    # One snapshot rebuild however many peers dropped. Only the exact PeerState is unregistered (a newer
+    # connection may already hold the same addr); sockets are closed so outbound peers, which have no
+    # reader thread, don't leak fds, and inbound readers wake from recv and exit.
+    global _peers_snapshot
+    with _peers_lock:
+        removed = [ps for ps in states if _peers.get(ps.addr) is ps]
+        for ps in removed:
+            del _peers[ps.addr]
+        if removed:
+            _peers_snapshot = tuple(_peers.values())
+    for ps in states:
+        try:
+            ps.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        try:
+            ps.sock.close()
+        except OSError:
+            pass
+
+
+def _p2p_frame(obj: dict) -> bytes:
+    # Raises orjson.JSONEncodeError (a TypeError) on values orjson can't encode, e.g. ints beyond 64 bits
+    buf = orjson.dumps(obj)
+    return len(buf).to_bytes(4, "big") + buf
+
+
+def _p2p_send(ps: PeerState, *objs: dict) -> bool:
+    # All messages of one batch go out in a single sendall (no per-message flush).
+    # An unencodable batch is logged and skipped; only a failed socket returns False.
+    try:
+        data = b"".join(_p2p_frame(o) for o in objs)
+    except orjson.JSONEncodeError as e:
+        print("P2P encode error:", ps.addr, e)
+        return True
+    return _p2p_send_raw(ps, data)
+
 
+def _p2p_send_raw(ps: PeerState, data: bytes) -> bool:
+    # data is one or more already-framed messages; False means the socket is dead
+    try:
+        with ps.send_lock:
+            ps.sock.sendall(data)
+        return True
+    except OSError:
+        return False
+
+
+def _p2p_broadcast(data: bytes):
+    # Send pre-framed data to every peer and drop the ones whose socket failed
+    dead = [ps for ps in _peers_snapshot if not _p2p_send_raw(ps, data)]
+    if dead:
+        _remove_peers(dead)
+
+
+class FrameReader:
+    """Reads length-prefixed frames from a socket into one reusable buffer via recv_into."""
+    def __init__(self, sock: socket.socket, bufsize: int = 65536):
+        self.sock = sock
+        self.buf = bytearray(bufsize)
+        self.start = 0  # first unconsumed byte
+        self.end = 0    # end of received data
+
+    def _fill(self, need: int) -> bool:
+        while self.end - self.start < need:
+            have = self.end - self.start
+            if len(self.buf) - self.start < need:
+                if len(self.buf) < need:
+                    # Fresh buffer rather than resize: the last returned view may still be referenced
+                    grown = bytearray(max(need, 2 * len(self.buf)))
+                    grown[:have] = self.buf[self.start:self.end]
+                    self.buf = grown
+                else:
+                    self.buf[:have] = self.buf[self.start:self.end]
+                self.start, self.end = 0, have
+            n = self.sock.recv_into(memoryview(self.buf)[self.end:])
+            if n == 0:
+                return False
+            self.end += n
+        return True
 
-def _p2p_send(fp, obj: dict):
+    def read_frame(self) -> Optional[memoryview]:
+        # Returns a view of one frame payload (valid until the next call), or None on EOF
+        if self.start == self.end:
+            self.start = self.end = 0
+        if not self._fill(4):
+            return None
+        n = int.from_bytes(self.buf[self.start:self.start + 4], "big")
+        if n > _P2P_MAX_FRAME:
+            raise ValueError(f"frame too large: {n}")
+        if not self._fill(4 + n):
+            return None
+        off = self.start + 4
+        self.start = off + n
+        return memoryview(self.buf)[off:off + n]
+
+
+def _hdr_blob(s, hh: str) -> Optional[bytes]:
+    with _hdr_blob_lock:
+        blob = _hdr_blob_cache.get(hh)
+        if blob is not None:
+            _hdr_blob_cache.move_to_end(hh)
+            return blob
+    h = s.query(BlockHeader).filter_by(hash_hex=hh).first()
+    if not h:
+        return None
+    # For BLOCKHDR response, include enough fields for accept_external_header,
+    # and also supply txids snapshot if known (we don't store full list; send empty for now)
     try:
-        fp.write((json.dumps(obj) + "\n").encode("utf-8"))
-        fp.flush()
-    except Exception:
-        pass
+        blob = _p2p_frame({
+            "type": "BLOCKHDR",
+            "headers": [{
+                "prev": h.prev_hash_hex,
+                "merkle": h.merkle_root_hex,
+                "ver": h.version,
+                "ts": h.timestamp,
+                "target": h.target,
+                "nonce": int(h.nonce),
+                "miner": h.miner_address,
+                "txids": [],  # unknown snapshot; external nodes will rebuild/compare
+                "hash": h.hash_hex
+            }]
+        })
+    except orjson.JSONEncodeError as e:
+        print("P2P encode error: BLOCKHDR", hh, e)
+        return None
+    with _hdr_blob_lock:
+        _hdr_blob_cache[hh] = blob
+        if len(_hdr_blob_cache) > _HDR_BLOB_CACHE_MAX:
+            _hdr_blob_cache.popitem(last=False)
+    return blob
 
 
 def _announce_tip_to_peers():
@@ -51,41 +224,72 @@ def _announce_tip_to_peers():
         if not tip:
             return
         inv = {"type": "INV", "items": [{"kind": "hdr", "hash": tip.hash_hex}]}
-    with _peers_lock:
-        for ps in list(_peers.values()):
-            _p2p_send(ps.fp, inv)
+    try:
+        data = _p2p_frame(inv)
+    except orjson.JSONEncodeError as e:
+        print("P2P encode error: tip INV", e)
+        return
+    _p2p_broadcast(data)
+
+
+# Tx INVs are coalesced and flushed by _inv_flusher instead of one message per txid
+_INV_FLUSH_MS = 50
+_INV_MAX_ITEMS = 500
+_pending_tx_inv: List[str] = []
+_pending_tx_inv_lock = threading.Lock()
 
 
 def _broadcast_txinv(txid: str):
-    inv = {"type": "INV", "items": [{"kind": "tx", "txid": txid}]}
-    with _peers_lock:
-        for ps in list(_peers.values()):
-            _p2p_send(ps.fp, inv)
+    with _pending_tx_inv_lock:
+        _pending_tx_inv.append(txid)
+
+
+def _flush_txinv():
+    global _pending_tx_inv
+    with _pending_tx_inv_lock:
+        if not _pending_tx_inv:
+            return
+        txids, _pending_tx_inv = _pending_tx_inv, []
+    data = b"".join(
+        _p2p_frame({"type": "INV", "items": [{"kind": "tx", "txid": t} for t in txids[i:i + _INV_MAX_ITEMS]]})
+        for i in range(0, len(txids), _INV_MAX_ITEMS)
+    )
+    _p2p_broadcast(data)
+
+
+def _inv_flusher():
+    while True:
+        time.sleep(_INV_FLUSH_MS / 1000.0)
+        try:
+            _flush_txinv()
+        except Exception:
+            pass
 
 
 def _serve_peer(sock: socket.socket, peer_addr: str):
-    fp = sock.makefile(mode="rwb")
+    reader = FrameReader(sock)
+    ps = PeerState(peer_addr, sock)
+    # One read session per peer connection for GETDATA lookups; tx inserts use their own short session
+    read_sess = get_db().session()
     try:
         # handshake
-        _p2p_send(fp, {"type": "VERSION", "time": now_ms()})
-        _p2p_send(fp, {"type": "VERACK"})
-        with _peers_lock:
-            _peers[peer_addr] = PeerState(peer_addr, fp)
+        _p2p_send(ps, {"type": "VERSION", "time": now_ms()}, {"type": "VERACK"})
+        _add_peer(peer_addr, ps)
 
         # main loop
         while True:
-            line = fp.readline()
-            if not line:
+            payload = reader.read_frame()
+            if payload is None:
                 break
             try:
-                msg = json.loads(line.decode("utf-8").strip())
-            except Exception:
+                msg = orjson.loads(payload)
+            except orjson.JSONDecodeError:
                 continue
             mtype = msg.get("type")
 
             # keepalive
             if mtype == "PING":
-                _p2p_send(fp, {"type": "PONG", "time": now_ms()})
+                _p2p_send(ps, {"type": "PONG", "time": now_ms()})
                 continue
             if mtype == "PONG":
                 continue
@@ -104,39 +308,23 @@ def _serve_peer(sock: socket.socket, peer_addr: str):
                         if txid and txid not in _seen_tx:
                             need_items.append({"kind": "tx", "txid": txid})
                 if need_items:
-                    _p2p_send(fp, {"type": "GETDATA", "items": need_items})
+                    _p2p_send(ps, {"type": "GETDATA", "items": need_items})
                 continue
 
             if mtype == "GETDATA":
                 items = msg.get("items") or []
-                db = get_db()
-                with db.session() as s:
+                replies: List[bytes] = []
+                s = read_sess
+                try:
                     for it in items:
                         kind = it.get("kind")
                         if kind == "hdr":
                             hh = (it.get("hash") or "").strip().lower()
                             if not hh:
                                 continue
-                            h = s.query(BlockHeader).filter_by(hash_hex=hh).first()
-                            if not h:
-                                continue
-                            # For BLOCKHDR response, include enough fields for accept_external_header,
-                            # and also supply txids snapshot if known (we don't store full list; send empty for now)
-                            hdr_msg = {
-                                "type": "BLOCKHDR",
-                                "headers": [{
-                                    "prev": h.prev_hash_hex,
-                                    "merkle": h.merkle_root_hex,
-                                    "ver": h.version,
-                                    "ts": h.timestamp,
-                                    "target": h.target,
-                                    "nonce": int(h.nonce),
-                                    "miner": h.miner_address,
-                                    "txids": [],  # unknown snapshot; external nodes will rebuild/compare
-                                    "hash": h.hash_hex
-                                }]
-                            }
-                            _p2p_send(fp, hdr_msg)
+                            blob = _hdr_blob(s, hh)
+                            if blob is not None:
+                                replies.append(blob)
                         elif kind == "tx":
                             txid = (it.get("txid") or "").strip().lower()
                             if not txid:
@@ -145,10 +333,18 @@ def _serve_peer(sock: socket.socket, peer_addr: str):
                             if not m:
                                 continue
                             try:
-                                tx_obj = json.loads(m.raw) if m.raw else {}
+                                tx_obj = orjson.loads(m.raw) if m.raw else {}
                             except Exception:
                                 tx_obj = {}
-                            _p2p_send(fp, {"type": "TX", "tx": tx_obj, "txid": txid})
+                            try:
+                                replies.append(_p2p_frame({"type": "TX", "tx": tx_obj, "txid": txid}))
+                            except orjson.JSONEncodeError as e:
+                                print("P2P encode error: TX", txid, e)
+                finally:
+                    # End the read transaction so the next batch sees fresh rows (and WAL isn't pinned)
+                    s.rollback()
+                if replies:
+                    _p2p_send_raw(ps, b"".join(replies))
                 continue
 
             if mtype == "BLOCKHDR":
@@ -197,6 +393,7 @@ def _serve_peer(sock: socket.socket, peer_addr: str):
                     existing = s.query(MempoolTx).filter_by(txid=txid).first()
                     if not existing:
                         tx_obj = msg.get("tx") or {}
+                        # Stored raw stays stdlib-json canonical, matching what the RPC tx path writes
                         try:
                             raw_compact = json.dumps(tx_obj, separators=(",", ":"), sort_keys=True)
                         except Exception:
@@ -229,14 +426,13 @@ def _serve_peer(sock: socket.socket, peer_addr: str):
                 continue
 
             # Unknown message
-            _p2p_send(fp, {"type": "ERR", "detail": f"unknown {mtype}"})
+            _p2p_send(ps, {"type": "ERR", "detail": f"unknown {mtype}"})
     except Exception as e:
         print("P2P conn error:", peer_addr, e)
     finally:
         try:
-            with _peers_lock:
-                _peers.pop(peer_addr, None)
-            fp.close()
+            _remove_peer(ps)
+            read_sess.close()
             sock.close()
         except Exception:
             pass
@@ -271,6 +467,7 @@ def start_p2p():
             time.sleep(5)
 
     threading.Thread(target=_periodic, daemon=True).start()
+    threading.Thread(target=_inv_flusher, daemon=True).start()
 
 
 def connect_peer(addr: str):
@@ -280,14 +477,14 @@ def connect_peer(addr: str):
         s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         s.settimeout(5.0)
         s.connect((host, port))
-        fp = s.makefile(mode="rwb")
+        ps = PeerState(addr, s)
         # handshake
-        _p2p_send(fp, {"type": "VERSION", "time": now_ms()})
-        _p2p_send(fp, {"type": "VERACK"})
-        with _peers_lock:
-            _peers[addr] = PeerState(addr, fp)
+        if not _p2p_send(ps, {"type": "VERSION", "time": now_ms()}, {"type": "VERACK"}):
+            s.close()
+            return False
+        _add_peer(addr, ps)
         # On connect, ask for peer tip by sending an empty INV to trigger GETDATA or direct BLOCKHDR
-        _p2p_send(fp, {"type": "PING", "time": now_ms()})
+        _p2p_send(ps, {"type": "PING", "time": now_ms()})
         return True
     except Exception as e:
         print("connect_peer error:", addr, e)
@@ -353,9 +550,11 @@ def main():
 
     if args.mine:
         print("Mining enabled. Submitting header-only blocks...")
+        # One keep-alive connection for the whole mining loop
+        sess = requests.Session()
         while True:
             try:
-                r = requests.post(f"{rpc_url}/rpc/mine_one", json={"miner_address": args.miner_address}, timeout=10)
+                r = sess.post(f"{rpc_url}/rpc/mine_one", json={"miner_address": args.miner_address}, timeout=10)
                 if r.status_code == 200:
                     print("Mined header hash:", r.json().get("hash"))
                 else:
@@ -1,12 +1,21 @@
 from __future__ import annotations
 
+import array
+import binascii
+import os
+import selectors
 import socket
 import threading
 import json
+import logging
 import time
-from typing import Dict, Optional, List, Tuple
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, List, Tuple
 
 import httpx
+import orjson
+from sqlalchemy import text
 import traceback
 import sys
 
@@ -15,7 +24,7 @@ from core.utils import now_ms, sha3_256_hex
 from core.consensus import Header, get_chain_height, get_header_by_height
 from core.pow.randomx_stub import difficulty_to_target
 from core.pow.pow_backend import pow_hash
-from core.db import get_db, KV
+from core.db import get_db
 
 
 # Minimal Stratum-like protocol (enhanced)
@@ -29,6 +38,38 @@ from core.db import get_db, KV
 # to append a block. KV stats can be read by explorer for a dashboard.
 
 
+def _target_bytes(target_hex: str) -> bytes:
+    # 32-byte big-endian target, so digest <= target is a plain bytes (memcmp) comparison
+    h = (target_hex or "").lower()
+    if h.startswith("0x"):
+        h = h[2:]
+    return bytes.fromhex(h.rjust(64, "0"))
+
+
+# Same quoting/escaping json.dumps applies to str values (ensure_ascii=True)
+_json_str = json.encoder.encode_basestring_ascii
+
+
+def _json_bytes(v) -> bytes:
+    # Compact like the header's json.dumps(fields, separators=(",", ":")), whatever the value type
+    return (_json_str(v) if isinstance(v, str) else json.dumps(v, separators=(",", ":"))).encode("ascii")
+
+
+def _tune_miner_socket(sock: socket.socket):
+    # Small newline-delimited frames: disable Nagle so notifies/replies aren't held back,
+    # and let keepalive prune silently dead miners instead of waiting for a failed write
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 256 * 1024)
+        if hasattr(socket, "TCP_KEEPIDLE"):  # Linux
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 20)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3)
+    except OSError as e:
+        log.debug("socket tuning failed: %s", e)
+
+
 class MiningJob:
     def __init__(self, job_id: str, prev_hash: str, version: int, target_hex: str, timestamp: int, txids: List[str], pool_diff: int):
         self.job_id = job_id
@@ -37,9 +78,33 @@ class MiningJob:
         self.target_hex = target_hex  # network target hint (from node tip or easy bootstrap)
         self.timestamp = timestamp
         self.txids = txids  # coinbase + snapshot txids
+        try:
+            # canonical form for comparing a submit's prev without string lowering
+            self.prev_hash_bytes: Optional[bytes] = bytes.fromhex(prev_hash or "")
+        except ValueError:
+            self.prev_hash_bytes = None
         self.pool_diff = pool_diff
         self.pool_target_hex = difficulty_to_target(pool_diff)
+        # Targets are fixed for the job's lifetime; decode once instead of per submit
+        self.pool_target_bytes = _target_bytes(self.pool_target_hex)
+        self.target_bytes = _target_bytes(target_hex or "ff" * 32)
+        # Share check specialized once per job: pool_diff <= 1 accepts every share without comparing
+        if pool_diff <= 1:
+            self.share_ok: Callable[[bytes], bool] = lambda d: True
+        else:
+            self.share_ok = lambda d, t=self.pool_target_bytes: d <= t
         self.created_ms = now_ms()
+        self.notify_bytes: bytes = b""  # set by the job loop when the job is installed
+        # Compact json.dumps of the consensus header field list with the job-constant fields filled in;
+        # version, merkle, timestamp, nonce and address are %-formatted in per submit
+        self._hdr_fmt = (
+            b'[["version",%%d],["prev_hash_hex",%s],["merkle_root_hex",%%s],["timestamp",%%d],'
+            b'["target",%s],["nonce",%%d],["miner_address",%%s],["tx_count",%d]]'
+        ) % (
+            _json_bytes((prev_hash or "").lower()).replace(b"%", b"%%"),
+            _json_bytes((target_hex or "").lower()).replace(b"%", b"%%"),
+            len(txids),
+        )
 
     def to_template(self) -> Dict[str, object]:
         return {
@@ -50,18 +115,66 @@ class MiningJob:
             "txids": self.txids,
         }
 
+    def header_bytes(self, version: int, merkle_root_hex: str, timestamp: int, nonce: int, miner_address: str) -> bytes:
+        # Byte-identical to json.dumps(fields, separators=(",", ":")) as built by miners and consensus
+        return self._hdr_fmt % (version, _json_bytes(merkle_root_hex), timestamp, nonce, _json_bytes(miner_address))
+
+    def build_notify(self, pool_diff: int) -> bytes:
+        # mining.notify line for this job, serialized once and shared by every client write
+        msg = {
+            "id": None,
+            "method": "mining.notify",
+            "params": {
+                "job_id": self.job_id,
+                "template": self.to_template(),
+                "pool_target": self.pool_target_hex,
+                "share_diff": pool_diff,
+            },
+        }
+        return _line(msg)
+
 
 class MinerConn:
-    def __init__(self, sock: socket.socket, addr: str):
+    def __init__(self, sock: socket.socket, addr: str, cid: int):
         self.sock = sock
         self.addr = addr
-        self.file = sock.makefile(mode="rwb")
-        self.address: Optional[str] = None
+        # Index into StratumPool's per-client counter arrays
+        self.cid = cid
+        # Replies (reactor/verify threads) and broadcasts (job thread) all write; keep lines whole
+        self.wlock = threading.Lock()
+        self.rbuf = bytearray()  # received bytes not yet terminated by "\n"
+        self.obuf = bytearray()  # bytes the kernel would not take yet; flushed on EVENT_WRITE (wlock)
+        self.want_write = False  # EVENT_WRITE requested or armed (wlock)
         self.alive = True
-        self.accepted_shares = 0
-        self.rejected_shares = 0
-        self.last_submit_ms = 0
-        self.hashes_5s = 0  # rough hashrate proxy from share attempts
+        self.closed = False  # socket unregistered and closed by the reactor
+        self.inflight = 0  # submits queued/running on the verify pool (wlock)
+
+
+# Per-share/per-message diagnostics; off unless the "pool" logger is set to DEBUG
+log = logging.getLogger("pool")
+
+# Drop a miner whose unterminated input exceeds this (no legitimate message is near it)
+_MAX_LINE = 64 * 1024
+
+# Drop a miner that stops reading once this much output is queued behind its socket buffer
+_MAX_OBUF = 1024 * 1024
+
+# Per-miner cap on submits awaiting PoW verification; beyond it submits are rejected as busy
+_MAX_INFLIGHT = 32
+
+# Selector key data for the reactor's wakeup socket (listener uses None, miners (cid, conn))
+_WAKE = "wake"
+
+# Cap on each recent-share window, independent of the 5-minute time prune
+_RECENT_MAX = 200_000
+
+# Single-statement KV upsert (same syntax on SQLite and Postgres)
+_KV_UPSERT = text("INSERT INTO kv (k, v) VALUES (:k, :v) ON CONFLICT (k) DO UPDATE SET v = excluded.v")
+
+
+def _line(obj) -> bytes:
+    # One newline-terminated protocol message
+    return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
 
 
 def _c(code: str, text: str) -> str:
@@ -75,20 +188,54 @@ class StratumPool:
         self.port = port
         self.server: Optional[socket.socket] = None
         self.clients: Dict[int, MinerConn] = {}
-        self._client_id = 0
-        self.lock = threading.Lock()
+        # Per-client counters as parallel arrays indexed by cid (== MinerConn.cid); the snapshot
+        # reads them without touching each MinerConn. Slots freed on disconnect are reused via _free_cids.
+        self._acc = array.array("q")
+        self._rej = array.array("q")
+        self._last_ms = array.array("q")
+        self._addrs: List[str] = []
+        self._free_cids: List[int] = []
+        # _clients_lock guards clients and slot allocation; _stats_lock guards the recent share windows and
+        # counter updates/resets (taken inside _clients_lock when both are needed).
+        # Neither is held while writing to sockets.
+        self._clients_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
         self.current_job: Optional[MiningJob] = None
         # Make initial share difficulty trivial to avoid "Low difficulty share" spam.
         # Network target is extremely easy during bootstrap; accept most shares.
         self.pool_diff = 1
         # rolling counters for dashboard
-        self._accepted_recent: List[Tuple[int, str]] = []  # [(ms, addr), ...]
-        self._rejected_recent: List[Tuple[int, str]] = []
+        # appended in time order, so expiry pops from the left; maxlen bounds memory under a share flood
+        self._accepted_recent: "deque[Tuple[int, str]]" = deque(maxlen=_RECENT_MAX)  # [(ms, addr), ...]
+        self._rejected_recent: "deque[Tuple[int, str]]" = deque(maxlen=_RECENT_MAX)
         # Node RPC base for job templating
         cfg = get_config()
         self.node_base = f"http://{cfg.get('network.rpc_host','127.0.0.1')}:{cfg.get('network.rpc_port',28445)}"
+        # One pooled keep-alive client for all node RPC (job polling, height query, block promotion)
+        self._http = httpx.Client(
+            base_url=self.node_base,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=8, max_connections=16),
+        )
         # Static job mode (disables rotation except on successful block or explicit tip advance)
         self.static_job_mode = True
+        # (job_id, address, nonce, timestamp, version, merkle, prev) -> digest; replayed submits skip pow_hash
+        self._digest_cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._digest_cache_max = 4096
+        self._digest_lock = threading.Lock()
+        # Share PoW verification (and any resulting promotion) runs off the reactor thread
+        self._verify_pool = ThreadPoolExecutor(max_workers=max(2, (os.cpu_count() or 2) - 1),
+                                               thread_name_prefix="share_verify")
+        # One selector thread reads every miner socket; no thread per connection
+        self._sel: Optional[selectors.BaseSelector] = None
+        self._running = False
+        # Connections with buffered output waiting for EVENT_WRITE to be armed by the reactor;
+        # other threads queue here and poke the wakeup socket instead of touching the selector
+        self._pending_write: List[Tuple[int, MinerConn]] = []
+        self._pending_lock = threading.Lock()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
 
     def start(self):
         s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -103,133 +250,292 @@ class StratumPool:
         threading.Thread(target=self._job_loop, daemon=True).start()
         threading.Thread(target=self._snapshot_loop, daemon=True).start()
 
+        # Non-blocking listener so one readiness event drains the whole accept backlog
+        s.setblocking(False)
+        self._sel = selectors.DefaultSelector()
+        self._sel.register(s, selectors.EVENT_READ, None)
+        self._sel.register(self._wake_r, selectors.EVENT_READ, _WAKE)
+        self._running = True
+        while self._running:
+            for key, mask in self._sel.select(timeout=1.0):
+                data = key.data
+                if data is None:
+                    self._accept_pending(s)
+                elif data is _WAKE:
+                    try:
+                        self._wake_r.recv(4096)
+                    except OSError:
+                        pass
+                else:
+                    if mask & selectors.EVENT_WRITE:
+                        self._on_writable(*data)
+                    if mask & selectors.EVENT_READ and not data[1].closed:
+                        self._on_readable(*data)
+            self._arm_pending_writes()
+
+    def stop(self):
+        self._running = False
+        try:
+            if self.server:
+                self.server.close()
+        finally:
+            self._verify_pool.shutdown(wait=False)
+            self._http.close()
+            for ws in (self._wake_r, self._wake_w):
+                ws.close()
+
+    def _accept_pending(self, s: socket.socket):
         while True:
-            client_sock, (chost, cport) = s.accept()
-            conn = MinerConn(client_sock, f"{chost}:{cport}")
-            with self.lock:
-                cid = self._client_id
-                self._client_id += 1
-                self.clients[cid] = conn
-            threading.Thread(target=self._handle_client, args=(cid, conn), daemon=True).start()
+            try:
+                client_sock, (chost, cport) = s.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            # Miner sockets are non-blocking too: a miner that stops reading must never stall the reactor
+            client_sock.setblocking(False)
+            _tune_miner_socket(client_sock)
+            self._accept_client(client_sock, f"{chost}:{cport}")
+
+    def _accept_client(self, client_sock: socket.socket, addr: str):
+        with self._clients_lock, self._stats_lock:
+            if self._free_cids:
+                cid = self._free_cids.pop()
+                self._acc[cid] = self._rej[cid] = self._last_ms[cid] = 0
+                self._addrs[cid] = ""
+            else:
+                cid = len(self._acc)
+                self._acc.append(0)
+                self._rej.append(0)
+                self._last_ms.append(0)
+                self._addrs.append("")
+            conn = MinerConn(client_sock, addr, cid)
+            self.clients[cid] = conn
+        print(_c("32", f"Client connected: {cid} {conn.addr}"))
+        # Registered before the first write so buffered output can arm EVENT_WRITE
+        self._sel.register(client_sock, selectors.EVENT_READ, (cid, conn))
+        log.debug("send subscribe to cid=%s", cid)
+        try:
+            # Send welcome, plus the current job in the same syscall
+            parts = [_line({"id": 0, "result": ["smelly-session"], "error": None, "method": "mining.subscribe"})]
+            job = self.current_job
+            if job:
+                log.debug("initial notify to cid=%s: job_id=%s prev=%.16s.. pool_target=%.8s..", cid, job.job_id, job.prev_hash, job.pool_target_hex)
+                parts.append(job.notify_bytes)
+            self._write_many(conn, parts)
+        except Exception as e:
+            print(_c("31", f"Client error: {cid} {e}"))
+            self._drop_client(cid, conn)
+
+    def _on_readable(self, cid: int, conn: MinerConn):
+        try:
+            chunk = conn.sock.recv(65536)
+        except OSError:
+            chunk = b""
+        if not chunk or not conn.alive:
+            self._drop_client(cid, conn)
+            return
+        buf = conn.rbuf
+        buf += chunk
+        try:
+            start = 0
+            while True:
+                end = buf.find(b"\n", start)
+                if end < 0:
+                    break
+                line = bytes(buf[start:end]).strip()
+                start = end + 1
+                if line:
+                    self._process_msg(conn, orjson.loads(line))
+            del buf[:start]
+            if len(buf) > _MAX_LINE:
+                raise ValueError("line too long")
+        except Exception as e:
+            print(_c("31", f"Client error: {cid} {e}"))
+            self._drop_client(cid, conn)
+
+    def _on_writable(self, cid: int, conn: MinerConn):
+        with conn.wlock:
+            try:
+                sent = conn.sock.send(conn.obuf)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                sent = -1
+            if sent >= 0:
+                del conn.obuf[:sent]
+                if not conn.obuf:
+                    conn.want_write = False
+                    self._sel.modify(conn.sock, selectors.EVENT_READ, (cid, conn))
+                return
+        self._drop_client(cid, conn)
+
+    def _arm_pending_writes(self):
+        with self._pending_lock:
+            if not self._pending_write:
+                return
+            pending, self._pending_write = self._pending_write, []
+        for cid, conn in pending:
+            if conn.closed:
+                continue
+            try:
+                self._sel.modify(conn.sock, selectors.EVENT_READ | selectors.EVENT_WRITE, (cid, conn))
+            except (KeyError, ValueError):
+                pass
+
+    def _drop_client(self, cid: int, conn: MinerConn):
+        # Reactor thread only: the selector is not touched from other threads
+        if conn.closed:
+            return
+        conn.closed = True
+        conn.alive = False
+        try:
+            self._sel.unregister(conn.sock)
+        except (KeyError, ValueError):
+            pass
+        try:
+            conn.sock.close()
+        except Exception:
+            pass
+        with self._clients_lock:
+            self.clients.pop(cid, None)
+            self._free_cids.append(cid)
+        print(_c("33", f"Client disconnected: {cid}"))
 
     def _broadcast_job(self):
-        if not self.current_job:
+        job = self.current_job
+        if not job:
             return
-        msg = {
-            "id": None,
-            "method": "mining.notify",
-            "params": {
-                "job_id": self.current_job.job_id,
-                "template": self.current_job.to_template(),
-                "pool_target": self.current_job.pool_target_hex,
-                "share_diff": self.pool_diff,
-            },
-        }
-        self._broadcast(msg)
+        self._broadcast_bytes(job.notify_bytes)
 
     def _broadcast(self, obj: dict):
-        data = (json.dumps(obj) + "\n").encode("utf-8")
-        with self.lock:
-            to_drop = []
-            for cid, conn in self.clients.items():
-                try:
-                    conn.file.write(data)
-                    conn.file.flush()
-                except Exception:
-                    to_drop.append(cid)
-            for cid in to_drop:
-                try:
-                    self.clients[cid].file.close()
-                    self.clients[cid].sock.close()
-                except Exception:
-                    pass
-                del self.clients[cid]
+        self._broadcast_bytes(_line(obj))
+
+    def _broadcast_bytes(self, data: bytes):
+        with self._clients_lock:
+            targets = list(self.clients.items())
+        to_drop = []
+        for cid, conn in targets:
+            try:
+                self._write(conn, data)
+            except Exception:
+                to_drop.append((cid, conn))
+        if not to_drop:
+            return
+        for cid, conn in to_drop:
+            # Shutdown wakes the reactor with EOF; it unregisters and closes the socket
+            conn.alive = False
+            try:
+                conn.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        with self._clients_lock:
+            for cid, _ in to_drop:
+                self.clients.pop(cid, None)
 
     def _job_loop(self):
         """
         Fetch node-issued jobs to eliminate prev/target drift.
         If height >= 200, expect tx snapshot (txids) in get_work and propagate to miners
         so their computed merkle matches node's rebuild.
+        Long-polls the node: each request returns as soon as the tip moves past the
+        current job's prev (or after ~30 s with a fresh job for mempool changes).
         """
-        last_job_id = None
         while True:
             try:
-                with httpx.Client(timeout=5.0) as c:
-                    r = c.post(f"{self.node_base}/rpc/get_work", json={"miner_address": None})
-                    if r.status_code != 200:
-                        print("Job loop error: get_work", r.status_code, r.text)
-                        time.sleep(2.0)
-                        continue
-                    job_json = r.json() or {}
-                    # Normalize fields and enforce lowercase for prev/txids consistency
-                    txids = [str(t).lower() for t in (job_json.get("txids") or [])]
-                    prev = str(job_json.get("prev_hash") or "").lower()
-                    tgt = str(job_json.get("target") or "").lower()
-                    ver = int(job_json.get("version") or 1)
-                    ts = int(job_json.get("timestamp") or int(time.time()))
-                    jid = str(job_json.get("job_id") or str(now_ms()))
-                    job = MiningJob(
-                        job_id=jid,
-                        prev_hash=prev,
-                        version=ver,
-                        target_hex=tgt,
-                        timestamp=ts,
-                        txids=txids,
-                        pool_diff=max(1, self.pool_diff),
-                    )
-                    # Only broadcast if changed
-                    if not self.current_job or job.job_id != last_job_id:
-                        self.current_job = job
-                        last_job_id = job.job_id
-                        print(_c("34", f"[DEBUG] built job id={job.job_id} prev={job.prev_hash[:16]}.. target={job.target_hex[:8]}.. txids={len(job.txids)}"))
-                        self._broadcast_job()
-                time.sleep(2.0)
+                job = self.current_job
+                since = job.prev_hash if job else ""
+                rpc = self._local_rpc()
+                if rpc is not None:
+                    self._install_job(rpc.next_work(since, 30.0))
+                    continue
+                r = self._http.get("/rpc/long_poll_work", params={"since": since, "timeout_s": 30}, timeout=35.0)
+                if r.status_code == 404:
+                    # node without long-poll support: plain get_work every 2 s
+                    r = self._http.post("/rpc/get_work", json={"miner_address": None}, timeout=5.0)
+                    time.sleep(2.0)
+                if r.status_code != 200:
+                    print("Job loop error: get_work", r.status_code, r.text)
+                    time.sleep(2.0)
+                    continue
+                self._install_job(r.json() or {})
             except Exception as e:
                 print("Job loop error:", e)
                 time.sleep(2.0)
 
-    def _handle_client(self, cid: int, conn: MinerConn):
-        print(_c("32", f"Client connected: {cid} {conn.addr}"))
-        print(_c("36", f"[DEBUG] send subscribe to cid={cid}"))
-        try:
-            # Send welcome
-            self._send(conn, {"id": 0, "result": ["smelly-session"], "error": None, "method": "mining.subscribe"})
-            if self.current_job:
-                notify = {
-                    "id": None,
-                    "method": "mining.notify",
-                    "params": {
-                        "job_id": self.current_job.job_id,
-                        "template": self.current_job.to_template(),
-                        "pool_target": self.current_job.pool_target_hex,
-                        "share_diff": self.pool_diff,
-                    },
-                }
-                print(_c("36", f"[DEBUG] initial notify to cid={cid}: job_id={self.current_job.job_id} prev={self.current_job.prev_hash[:16]}.. pool_target={self.current_job.pool_target_hex[:8]}.."))
-                self._send(conn, notify)
-            while conn.alive:
-                line = conn.file.readline()
-                if not line:
-                    break
-                msg = json.loads(line.decode("utf-8").strip())
-                self._process_msg(conn, msg)
-        except Exception as e:
-            print(_c("31", f"Client error: {cid} {e}"))
-        finally:
-            try:
-                conn.file.close()
-                conn.sock.close()
-            except Exception:
-                pass
-            with self.lock:
-                if cid in self.clients:
-                    del self.clients[cid]
-            print(_c("33", f"Client disconnected: {cid}"))
+    @staticmethod
+    def _local_rpc():
+        # Node RPC app serving from this process (tools/run.py co-hosts them): build jobs with a
+        # direct call instead of a loopback HTTP round trip. Never imports core.rpc itself.
+        rpc = sys.modules.get("core.rpc")
+        return rpc if rpc is not None and rpc.is_serving() else None
+
+    def _install_job(self, job_json: dict):
+        # Normalize fields and enforce lowercase for prev/txids consistency
+        txids = [str(t).lower() for t in (job_json.get("txids") or [])]
+        prev = str(job_json.get("prev_hash") or "").lower()
+        tgt = str(job_json.get("target") or "").lower()
+        ver = int(job_json.get("version") or 1)
+        ts = int(job_json.get("timestamp") or int(time.time()))
+        jid = str(job_json.get("job_id") or str(now_ms()))
+        job = MiningJob(
+            job_id=jid,
+            prev_hash=prev,
+            version=ver,
+            target_hex=tgt,
+            timestamp=ts,
+            txids=txids,
+            pool_diff=max(1, self.pool_diff),
+        )
+        # Only broadcast if changed
+        cur = self.current_job
+        if not cur or job.job_id != cur.job_id:
+            job.notify_bytes = job.build_notify(self.pool_diff)
+            self.current_job = job
+            log.debug("built job id=%s prev=%.16s.. target=%.8s.. txids=%d", job.job_id, job.prev_hash, job.target_hex, len(job.txids))
+            self._broadcast_job()
 
     def _send(self, conn: MinerConn, obj: dict):
-        data = (json.dumps(obj) + "\n").encode("utf-8")
-        conn.file.write(data)
-        conn.file.flush()
+        self._write(conn, _line(obj))
+
+    def _write(self, conn: MinerConn, data: bytes):
+        self._write_many(conn, [data])
+
+    def _write_many(self, conn: MinerConn, parts: List[bytes]):
+        # Non-blocking: hand the kernel what it takes now (scatter-gather via sendmsg where available),
+        # buffer the rest and let the reactor flush it on EVENT_WRITE
+        with conn.wlock:
+            if not conn.alive:
+                raise ConnectionError("client closed")
+            if conn.obuf:
+                for p in parts:
+                    conn.obuf += p
+            else:
+                try:
+                    if len(parts) > 1 and hasattr(conn.sock, "sendmsg"):
+                        sent = conn.sock.sendmsg(parts)
+                    else:
+                        sent = conn.sock.send(parts[0] if len(parts) == 1 else b"".join(parts))
+                except (BlockingIOError, InterruptedError):
+                    sent = 0
+                if sent >= sum(len(p) for p in parts):
+                    return
+                conn.obuf += memoryview(b"".join(parts))[sent:]
+            if len(conn.obuf) > _MAX_OBUF:
+                # Miner stopped reading; shutdown wakes the reactor with EOF, which drops it
+                conn.alive = False
+                try:
+                    conn.sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+                raise ConnectionError("output buffer full")
+            if conn.want_write:
+                return
+            conn.want_write = True
+        with self._pending_lock:
+            self._pending_write.append((conn.cid, conn))
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            pass  # wakeup buffer full: a wake is already pending
 
     def _reply(self, conn: MinerConn, id_val, result=None, error=None):
         self._send(conn, {"id": id_val, "result": result, "error": error})
@@ -240,15 +546,18 @@ class StratumPool:
             params = msg.get("params") or []
             if not params:
                 return self._reply(conn, msg.get("id"), result=False, error="Address required")
-            conn.address = params[0]
-            print(_c("36", f"[DEBUG] authorize ok addr={conn.address} cid={id(conn)}"))
+            if not isinstance(params[0], str):
+                # address keys the share digest cache and is %-formatted into headers: must be a str
+                return self._reply(conn, msg.get("id"), result=False, error="Invalid params")
+            self._addrs[conn.cid] = params[0]
+            log.debug("authorize ok addr=%s cid=%s", params[0], conn.cid)
             return self._reply(conn, msg.get("id"), result=True, error=None)
 
         if method == "mining.get_job":
             if not self.current_job:
                 return self._reply(conn, msg.get("id"), result=None, error="No job")
             job = self.current_job
-            print(_c("36", f"[DEBUG] get_job -> job_id={job.job_id} prev={job.prev_hash[:16]}.. target={job.target_hex[:8]}.."))
+            log.debug("get_job -> job_id=%s prev=%.16s.. target=%.8s..", job.job_id, job.prev_hash, job.target_hex)
             return self._reply(conn, msg.get("id"), result={
                 "job_id": job.job_id,
                 "template": job.to_template(),
@@ -263,123 +572,179 @@ class StratumPool:
                 # [address, job_id, nonce, timestamp, merkle_root_hex, version, prev_hash_hex?]
                 address, job_id, nonce, timestamp, merkle_root_hex, version = params[:6]
                 prev_from_submit = params[6] if len(params) >= 7 else None
+                if not isinstance(address, str):
+                    raise TypeError("address must be a string")
                 nonce = int(nonce)
                 timestamp = int(timestamp)
                 version = int(version)
+                # Hex fields are validated and case-normalized once, here, as raw bytes
+                merkle_b = binascii.unhexlify(merkle_root_hex or "")
+                prev_b = binascii.unhexlify(prev_from_submit) if prev_from_submit else None
             except Exception:
-                print(_c("31", f"[DEBUG] invalid submit params: {msg}"))
+                log.debug("invalid submit params: %s", msg)
                 return self._reply(conn, msg.get("id"), result=False, error="Invalid params")
             # Stale job check; allow small grace if prev_hash matches but job_id rotated recently
             if not self.current_job:
-                print(_c("33", f"[DEBUG] stale job: no current_job"))
+                log.debug("stale job: no current_job")
                 return self._reply(conn, msg.get("id"), result=False, error="Stale job")
             if job_id != self.current_job.job_id:
                 # Allow only if prev matches; otherwise stale
-                current_prev = (self.current_job.prev_hash or "").lower()
-                if prev_from_submit:
-                    prev_from_submit = prev_from_submit.lower()
-                if not prev_from_submit:
-                    print(_c("33", f"[DEBUG] stale job (no prev provided) cur_job_id={self.current_job.job_id} submit_job_id={job_id}"))
+                current_prev = self.current_job.prev_hash
+                if prev_b is None:
+                    log.debug("stale job (no prev provided) cur_job_id=%s submit_job_id=%s", self.current_job.job_id, job_id)
                     return self._reply(conn, msg.get("id"), result=False, error="Stale job")
-                if prev_from_submit != current_prev:
-                    print(_c("33", f"[DEBUG] stale job: prev mismatch submit_prev={prev_from_submit[:16]}.. cur_prev={current_prev[:16]}.."))
+                if prev_b != self.current_job.prev_hash_bytes:
+                    log.debug("stale job: prev mismatch submit_prev=%.16s.. cur_prev=%.16s..", prev_from_submit, current_prev)
                     return self._reply(conn, msg.get("id"), result=False, error="Stale job")
-                print(_c("35", f"[DEBUG] accept rotated job_id with same prev={current_prev[:16]}.."))
+                log.debug("accept rotated job_id with same prev=%.16s..", current_prev)
 
             job = self.current_job
-            # Build header bytes exactly like miners and consensus
-            fields = [
-                ("version", version),
-                ("prev_hash_hex", (job.prev_hash or "").lower()),
-                ("merkle_root_hex", (merkle_root_hex or "").lower()),
-                ("timestamp", timestamp),
-                ("target", (job.target_hex or "").lower()),
-                ("nonce", nonce),
-                ("miner_address", address),
-                ("tx_count", len(job.txids)),
-            ]
-            hdr_bytes = json.dumps(fields, separators=(",", ":"), sort_keys=False).encode("utf-8")
-            # Use prev_from_submit (already lowercase) to ensure identical digest path with miner
-            digest = pow_hash(hdr_bytes, nonce, prev_from_submit or (job.prev_hash or ""))
-            print(_c("36", f"[DEBUG] share submit addr={address} job_id={job_id} cur_job={job.job_id} prev={job.prev_hash[:16]}.. nonce={nonce} ts={timestamp} digest={digest.hex()[:16]}.. pool_target={job.pool_target_hex[:8]}.. net_target={job.target_hex[:8]}.."))
-
-            # Share target check (pool difficulty). If pool_diff <= 1, accept all shares.
-            if self.pool_diff > 1 and int(digest.hex(), 16) > int(job.pool_target_hex, 16):
-                conn.rejected_shares += 1
-                with self.lock:
-                    self._rejected_recent.append((now_ms(), address))
-                print(_c("33", f"[DEBUG] share low diff digest={digest.hex()[:16]}.. > pool_target (share_diff={self.pool_diff})"))
-                return self._reply(conn, msg.get("id"), result=False, error="Low difficulty share")
-
-            # Accept share
-            conn.accepted_shares += 1
-            conn.last_submit_ms = now_ms()
-            with self.lock:
-                self._accepted_recent.append((conn.last_submit_ms, address))
-            self._reply(conn, msg.get("id"), result=True, error=None)
-            print(_c("32", f"[DEBUG] share accepted addr={address} accepted={conn.accepted_shares} rejected={conn.rejected_shares}"))
-
-            # If meets network target, promote via node; select merkle strategy based on height/job
-            if int(digest.hex(), 16) <= int(job.target_hex, 16):
-                try:
-                    # Query height to decide bootstrap vs mempool-merkle mode
-                    height_now = -1
-                    with httpx.Client(timeout=3.0) as c:
-                        r_h = c.get(f"{self.node_base}/rpc/get_height")
-                        if r_h.status_code == 200:
-                            height_now = int((r_h.json() or {}).get("height", -1))
-                    # Always forward the miner-provided merkle and the exact txids snapshot;
-                    # the node will decide to rebuild coinbase-only when height < bootstrap_cutoff.
-                    payload = {
-                        "job_id": job.job_id,
-                        "miner_address": address,
-                        "nonce": int(nonce),
-                        "timestamp": int(timestamp),
-                        "version": int(version),
-                        "merkle_root_hex": (merkle_root_hex or "").lower(),
-                        "prev_hash_hex": (prev_from_submit or job.prev_hash).lower(),
-                        "txids": [t.lower() for t in (job.txids or [])],
-                    }
-                    with httpx.Client(timeout=10.0) as c:
-                        resp = c.post(f"{self.node_base}/rpc/submit_work", json=payload)
-                    if resp.status_code == 200 and isinstance(resp.json(), dict) and resp.json().get("accepted"):
-                        hh = resp.json().get("hash")
-                        print(_c("1;32", f"[POOL] FOUND BLOCK {hh} by {address} (h={height_now+1} prev={job.prev_hash[:16]}.. target={job.target_hex[:8]}.. merkle={'coinbase' if height_now<200 else 'txs'})"))
-                        self._rotate_job_async()
-                        return None
-                    # Rejection diagnostics
-                    try:
-                        detail = resp.json()
-                    except Exception:
-                        detail = {"text": resp.text}
-                    print(_c("1;31", f"[POOL] promotion rejected by node: {detail}"))
-                    if isinstance(detail, dict):
-                        det = detail.get("detail") or detail
-                        err = str(det.get("error") if isinstance(det, dict) and "error" in det else det).lower()
-                        # If merkle mismatch at >=200, force job refresh from node to sync txids snapshot
-                        if "merkle" in err or "txids" in err:
-                            print(_c("35", "[DEBUG] refreshing job from node due to merkle mismatch"))
-                            self._rotate_job_async()
-                        # If prev/lease issues, rotate as well
-                        if any(k in err for k in ["stale", "prev", "expired", "unknown job"]):
-                            print(_c("35", "[DEBUG] rotating job due to lease/prev issue"))
-                            self._rotate_job_async()
-                except Exception as e:
-                    print(_c("1;31", f"[POOL] Promotion exception: {e}"))
-                    traceback.print_exc()
-                    self._rotate_job_async()
+            # Bound queued work per miner so one pipelining client can't grow the verify queue unboundedly
+            with conn.wlock:
+                if conn.inflight >= _MAX_INFLIGHT:
+                    busy = True
+                else:
+                    busy = False
+                    conn.inflight += 1
+            if busy:
+                log.debug("submit rejected: %d verifications in flight cid=%s", _MAX_INFLIGHT, conn.cid)
+                return self._reply(conn, msg.get("id"), result=False, error="Busy")
+            # PoW check, reply and promotion run on the verify pool; the reactor moves on to other miners
+            self._verify_pool.submit(self._verify_share, conn, msg.get("id"), address, job, nonce,
+                                     timestamp, version, merkle_b, prev_b)
             return None
 
         # Unknown
         return self._reply(conn, msg.get("id"), result=None, error="Unknown method")
 
 
+    def _verify_share(self, conn: MinerConn, msg_id, address: str, job: MiningJob, nonce: int, timestamp: int,
+                      version: int, merkle_b: bytes, prev_b: Optional[bytes]):
+        try:
+            self._verify_and_maybe_promote(conn, msg_id, address, job, nonce, timestamp, version,
+                                           merkle_b, prev_b)
+        except Exception:
+            log.exception("share verify error: %s", conn.addr)
+            # The miner must still get an answer for this id (a dropped conn just skips it)
+            if conn.alive:
+                try:
+                    self._reply(conn, msg_id, result=False, error="Internal error")
+                except Exception:
+                    pass
+        finally:
+            with conn.wlock:
+                conn.inflight -= 1
+
+    def _verify_and_maybe_promote(self, conn: MinerConn, msg_id, address: str, job: MiningJob, nonce: int,
+                                  timestamp: int, version: int, merkle_b: bytes, prev_b: Optional[bytes]):
+        digest = self._share_digest(job, address, nonce, timestamp, version, merkle_b, prev_b)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("share submit addr=%s job_id=%s prev=%.16s.. nonce=%d ts=%d digest=%.16s.. pool_target=%.8s.. net_target=%.8s..",
+                      address, job.job_id, job.prev_hash, nonce, timestamp, digest.hex(), job.pool_target_hex, job.target_hex)
+
+        # Share target check (pool difficulty). If pool_diff <= 1, accept all shares.
+        if not job.share_ok(digest):
+            with self._stats_lock:
+                # a dropped conn's slot may already belong to a new miner
+                if not conn.closed:
+                    self._rej[conn.cid] += 1
+                self._rejected_recent.append((now_ms(), address))
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("share low diff digest=%.16s.. > pool_target (share_diff=%d)", digest.hex(), self.pool_diff)
+            return self._reply(conn, msg_id, result=False, error="Low difficulty share")
+
+        # Accept share
+        cid = conn.cid
+        nowm = now_ms()
+        with self._stats_lock:
+            if not conn.closed:
+                self._acc[cid] += 1
+                self._last_ms[cid] = nowm
+            self._accepted_recent.append((nowm, address))
+        self._reply(conn, msg_id, result=True, error=None)
+        log.debug("share accepted addr=%s accepted=%d rejected=%d", address, self._acc[cid], self._rej[cid])
+
+        # If meets network target, promote via node; select merkle strategy based on height/job
+        if digest <= job.target_bytes:
+            try:
+                # Query height to decide bootstrap vs mempool-merkle mode
+                height_now = -1
+                r_h = self._http.get("/rpc/get_height", timeout=3.0)
+                if r_h.status_code == 200:
+                    height_now = int((r_h.json() or {}).get("height", -1))
+                # Always forward the miner-provided merkle and the exact txids snapshot;
+                # the node will decide to rebuild coinbase-only when height < bootstrap_cutoff.
+                payload = {
+                    "job_id": job.job_id,
+                    "miner_address": address,
+                    "nonce": int(nonce),
+                    "timestamp": int(timestamp),
+                    "version": int(version),
+                    "merkle_root_hex": merkle_b.hex(),
+                    "prev_hash_hex": prev_b.hex() if prev_b else job.prev_hash,
+                    "txids": list(job.txids or []),  # lowercased when the job was installed
+                }
+                resp = self._http.post("/rpc/submit_work", json=payload, timeout=10.0)
+                if resp.status_code == 200 and isinstance(resp.json(), dict) and resp.json().get("accepted"):
+                    hh = resp.json().get("hash")
+                    print(_c("1;32", f"[POOL] FOUND BLOCK {hh} by {address} (h={height_now+1} prev={job.prev_hash[:16]}.. target={job.target_hex[:8]}.. merkle={'coinbase' if height_now<200 else 'txs'})"))
+                    self._rotate_job_async()
+                    return None
+                # Rejection diagnostics
+                try:
+                    detail = resp.json()
+                except Exception:
+                    detail = {"text": resp.text}
+                print(_c("1;31", f"[POOL] promotion rejected by node: {detail}"))
+                if isinstance(detail, dict):
+                    det = detail.get("detail") or detail
+                    err = str(det.get("error") if isinstance(det, dict) and "error" in det else det).lower()
+                    # If merkle mismatch at >=200, force job refresh from node to sync txids snapshot
+                    if "merkle" in err or "txids" in err:
+                        log.debug("refreshing job from node due to merkle mismatch")
+                        self._rotate_job_async()
+                    # If prev/lease issues, rotate as well
+                    if any(k in err for k in ["stale", "prev", "expired", "unknown job"]):
+                        log.debug("rotating job due to lease/prev issue")
+                        self._rotate_job_async()
+            except Exception as e:
+                print(_c("1;31", f"[POOL] Promotion exception: {e}"))
+                traceback.print_exc()
+                self._rotate_job_async()
+        return None
+
+    def _share_digest(self, job: MiningJob, address: str, nonce: int, timestamp: int, version: int,
+                      merkle_b: bytes, prev_b: Optional[bytes]) -> bytes:
+        key = (job.job_id, address, nonce, timestamp, version, merkle_b, prev_b)
+        with self._digest_lock:
+            digest = self._digest_cache.get(key)
+            if digest is not None:
+                self._digest_cache.move_to_end(key)
+                return digest
+        # Submitted prev (lowercase hex) when given, to ensure identical digest path with miner
+        prev_key = prev_b.hex() if prev_b else (job.prev_hash or "")
+        hdr_bytes = job.header_bytes(version, merkle_b.hex(), timestamp, nonce, address)
+        digest = pow_hash(hdr_bytes, nonce, prev_key)
+        with self._digest_lock:
+            self._digest_cache[key] = digest
+            if len(self._digest_cache) > self._digest_cache_max:
+                self._digest_cache.popitem(last=False)
+        return digest
+
     def _rotate_job_async(self):
         # Trigger job rebuild without blocking submit thread
         def _do():
             try:
-                # Simple way: set current_job to None; job loop will rebuild next tick
+                # Drop the current job and fetch a replacement right away; the job loop may be
+                # parked in a long-poll that only returns on a tip change
                 self.current_job = None
+                rpc = self._local_rpc()
+                if rpc is not None:
+                    self._install_job(rpc.next_work())
+                    return
+                r = self._http.post("/rpc/get_work", json={"miner_address": None}, timeout=5.0)
+                if r.status_code == 200:
+                    self._install_job(r.json() or {})
             except Exception:
                 pass
         threading.Thread(target=_do, daemon=True).start()
@@ -397,39 +762,47 @@ class StratumPool:
         while True:
             try:
                 nowm = now_ms()
-                with self.lock:
-                    # prune recent lists
-                    self._accepted_recent = [(t, a) for (t, a) in self._accepted_recent if nowm - t <= WINDOW_MS]
-                    self._rejected_recent = [(t, a) for (t, a) in self._rejected_recent if nowm - t <= WINDOW_MS]
-                    miners = []
-                    total_h = 0.0
-                    for _, conn in list(self.clients.items()):
-                        # Estimate hashrate from accepted shares in window per miner (very rough)
-                        acc = len([1 for (t, a) in self._accepted_recent if a == (conn.address or "")])
-                        # scale shares per window by share difficulty into an H/s-ish proxy
-                        # share_target ~ difficulty_to_target(share_diff); we simply use acc/window as proxy
-                        hr = acc / max(1.0, WINDOW_MS / 1000.0)
-                        total_h += hr
-                        miners.append({
-                            "addr": conn.address or "(unauth)",
-                            "accepted": conn.accepted_shares,
-                            "rejected": conn.rejected_shares,
-                            "last_submit_ms": conn.last_submit_ms,
-                            "hashrate": f"{hr:.2f}",
-                        })
-                    snap = {
-                        "miners": miners,
-                        "share_diff": self.pool_diff,
-                        "accepted_5m": len(self._accepted_recent),
-                        "rejected_5m": len(self._rejected_recent),
-                        "total_hashrate": total_h,
-                        "ts": nowm,
-                    }
+                with self._stats_lock:
+                    # prune recent lists, then take a flat copy; counting and JSON happen unlocked
+                    for dq in (self._accepted_recent, self._rejected_recent):
+                        while dq and nowm - dq[0][0] > WINDOW_MS:
+                            dq.popleft()
+                    accepted_recent = list(self._accepted_recent)
+                    rejected_5m = len(self._rejected_recent)
+                # accepted shares per address in the window, counted in one pass
+                acc_ctr = Counter(a for _, a in accepted_recent)
+                accepted_5m = len(accepted_recent)
+                with self._clients_lock:
+                    cids = list(self.clients.keys())
+                acc_arr, rej_arr, last_arr, addrs = self._acc, self._rej, self._last_ms, self._addrs
+                miners = []
+                total_h = 0.0
+                for cid in cids:
+                    addr = addrs[cid]
+                    # Estimate hashrate from accepted shares in window per miner (very rough)
+                    acc = acc_ctr.get(addr, 0)
+                    # scale shares per window by share difficulty into an H/s-ish proxy
+                    # share_target ~ difficulty_to_target(share_diff); we simply use acc/window as proxy
+                    hr = acc / max(1.0, WINDOW_MS / 1000.0)
+                    total_h += hr
+                    miners.append({
+                        "addr": addr or "(unauth)",
+                        "accepted": acc_arr[cid],
+                        "rejected": rej_arr[cid],
+                        "last_submit_ms": last_arr[cid],
+                        "hashrate": f"{hr:.2f}",
+                    })
+                snap = {
+                    "miners": miners,
+                    "share_diff": self.pool_diff,
+                    "accepted_5m": accepted_5m,
+                    "rejected_5m": rejected_5m,
+                    "total_hashrate": total_h,
+                    "ts": nowm,
+                }
                 # persist
                 with db.session() as s:
-                    row = s.get(KV, "pool_snapshot_json") or KV(k="pool_snapshot_json", v="")
-                    row.v = json.dumps(snap, separators=(",", ":"), sort_keys=False)
-                    s.merge(row)
+                    s.execute(_KV_UPSERT, {"k": "pool_snapshot_json", "v": orjson.dumps(snap).decode("utf-8")})
                     s.commit()
             except Exception as e:
                 print("[POOL] snapshot error:", e)
@@ -1,32 +1,72 @@
 from __future__ import annotations
 
+import asyncio
+import functools
+import hmac
 import os
 import secrets
-from typing import Optional, List
+import threading
+import time
+from base64 import b64encode, urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, List
 
 from fastapi import FastAPI, HTTPException, Request, Response, Depends
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+from pydantic import BaseModel, PrivateAttr
 import uvicorn
 from argon2 import PasswordHasher
-from sqlalchemy import func
+from argon2.low_level import Type, hash_secret_raw
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import IntegrityError
 import hashlib
 
 from core.config import get_config
 from core.utils import ensure_dirs, now_ms
-from core.db import get_db, WalletAccount, SubAddress, UTXO, Reward, Transaction, MempoolTx, User
+from core.db import get_db, KV, WalletAccount, SubAddress, UTXO, Reward, Transaction, MempoolTx, User
 from core.crypto import generate_seed, ed25519_keypair_from_seed, encode_address, derive_subaddress
 import httpx
+import orjson
 
-# Note: For production, add session signing keys loaded from config/secret
 SESSION_COOKIE = "smelly_sid"
 CSRF_HEADER = "x-smelly-csrf"
 SESSION_MAX_AGE = 60 * 60 * 24 * 7  # 7 days
 PH = PasswordHasher()
-
-
-app = FastAPI(title="SMELLY Web Wallet", version="0.2")
+_SESSION_KEY = os.urandom(32)  # replaced at startup by the configured/persisted key
+
+# AESGCM ciphers over derived wallet keys, keyed by blake2b(passphrase || salt). Salts are random per
+# account, so an entry is scoped to one wallet. Short TTL bounds how long key material stays resident;
+# it is not zeroized (the cipher object keeps its own copy of the key).
+_KEY_CACHE: "OrderedDict[bytes, tuple[Any, float]]" = OrderedDict()
+_KEY_CACHE_LOCK = threading.Lock()
+_KEY_CACHE_TTL_S = 60.0
+_KEY_CACHE_MAX = 128
+_IN_BATCH = 500  # max values per SQL IN (...) list
+_PRIMARY_ADDR_CACHE: dict[int, str] = {}  # account_id -> primary (0/0) subaddress
+
+# Template env built once at import: compiled templates stay in memory across requests (and
+# don't depend on startup hooks having run), bytecode survives restarts.
+# No per-request stat() of template files unless SMELLY_DEV is set (template hot-reload).
+# Bytecode is unmarshalled and executed, so it lives in Jinja's default per-user cache dir
+# (created 0700, ownership checked) rather than a shared temp path.
+_JINJA_ENV = Environment(
+    loader=FileSystemLoader(os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")),
+    autoescape=select_autoescape(["html", "xml"]),
+    bytecode_cache=FileSystemBytecodeCache(),
+    auto_reload=bool(os.environ.get("SMELLY_DEV")),
+    cache_size=400,
+)
+
+
+app = FastAPI(title="SMELLY Web Wallet", version="0.2", default_response_class=ORJSONResponse)
+# Mempool/balance/UTXO lists are large, repetitive JSON; small responses are left as-is.
+# proxy_rpc is safe: httpx hands it decoded node bodies and it sets no content-encoding.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 
 # ------------ Models (API v1) -------------
@@ -56,28 +96,51 @@ class SendRequest(BaseModel):
     amount: float
     fee: float  # custom fee per tx
     memo: Optional[str] = ""
+    _dk: Optional[str] = PrivateAttr(default=None)
 
     def dedupe_key(self) -> str:
-        # Deterministic idempotency key derived from payload (address pair + amount+fee+memo)
-        h = hashlib.sha256()
-        h.update((self.from_address or "").encode("utf-8"))
-        h.update(b"|")
-        h.update((self.to_address or "").encode("utf-8"))
-        h.update(b"|")
-        h.update(f"{float(self.amount):.12f}".encode("utf-8"))
-        h.update(b"|")
-        h.update(f"{float(self.fee):.12f}".encode("utf-8"))
-        h.update(b"|")
-        h.update((self.memo or "").encode("utf-8"))
-        return h.hexdigest()
+        # Deterministic idempotency key derived from payload (address pair + amount+fee+memo); computed once
+        if self._dk is None:
+            buf = b"\x00".join((
+                (self.from_address or "").encode("utf-8"),
+                (self.to_address or "").encode("utf-8"),
+                f"{float(self.amount):.12f}".encode("utf-8"),
+                f"{float(self.fee):.12f}".encode("utf-8"),
+                (self.memo or "").encode("utf-8"),
+            ))
+            self._dk = hashlib.blake2b(buf, digest_size=32).hexdigest()
+        return self._dk
 
 
 # ------------ Startup -------------
 
 @app.on_event("startup")
-def on_startup():
+async def on_startup():
     ensure_dirs()
     get_db()  # ensure DB initialized
+    app.state.crypto_pool = ThreadPoolExecutor(
+        max_workers=int(get_config().get("wallet.crypto_workers", max(1, (os.cpu_count() or 2) // 2))),
+        thread_name_prefix="wallet-crypto",
+    )
+    global _SESSION_KEY
+    _SESSION_KEY = _load_session_key()
+    _decode_session.cache_clear()
+    # One keep-alive client for all node calls (height, /rpc proxy) instead of a connection per request
+    app.state.node_http = httpx.AsyncClient(
+        base_url=_node_base_url(),
+        timeout=httpx.Timeout(10.0, connect=2.0),
+        limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+    )
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    node_http = getattr(app.state, "node_http", None)
+    if node_http is not None:
+        await node_http.aclose()
+    crypto_pool = getattr(app.state, "crypto_pool", None)
+    if crypto_pool is not None:
+        crypto_pool.shutdown(wait=False)
 
 
 # ------------ Session + CSRF (minimal demo) -------------
@@ -85,36 +148,175 @@ def on_startup():
 def _get_session_id(req: Request) -> Optional[str]:
     return req.cookies.get(SESSION_COOKIE)
 
-def _issue_session(resp: Response, user_id: int, account_id: int | None = None) -> str:
-    # Very simple signed cookie: sid|uid|acct|nonce (improve to HMAC if needed)
-    sid = secrets.token_hex(16)
-    payload = f"{sid}|{user_id}|{account_id or 0}|{secrets.token_hex(8)}"
+# Insert-if-absent (same syntax on SQLite and Postgres); an empty leftover row is filled in too
+_SESSION_SECRET_INSERT = text(
+    "INSERT INTO kv (k, v) VALUES (:k, :v) ON CONFLICT (k) DO UPDATE SET v = excluded.v WHERE kv.v = ''"
+)
+
+
+def _load_session_key() -> bytes:
+    # wallet.session_key (hex) from config, else a random secret persisted in KV so cookies survive restarts
+    cfg_key = get_config().get("wallet.session_key")
+    if cfg_key:
+        return bytes.fromhex(str(cfg_key))
+    with get_db().session() as s:
+        row = s.get(KV, "wallet_session_secret")
+        if row and row.v:
+            return bytes.fromhex(row.v)
+        # Several workers may get here at once: only the first insert lands, and everyone
+        # (including the losers) signs with the stored value, never their own candidate
+        s.execute(_SESSION_SECRET_INSERT, {"k": "wallet_session_secret", "v": os.urandom(32).hex()})
+        s.commit()
+        stored = s.execute(select(KV.v).where(KV.k == "wallet_session_secret")).scalar_one()
+        return bytes.fromhex(stored)
+
+
+def _issue_session(resp: Response, user_id: int, account_id: int | None = None) -> None:
+    # Signed cookie: b64url(hmac_sha256(payload) || payload), payload = orjson {u, a, n, exp}
+    # n: one 12-byte draw so each issued cookie is distinct; nothing else keys on it
+    payload = orjson.dumps({
+        "u": user_id, "a": account_id or 0, "n": secrets.token_urlsafe(12), "exp": int(time.time()) + SESSION_MAX_AGE,
+    })
+    sig = hmac.new(_SESSION_KEY, payload, hashlib.sha256).digest()
     resp.set_cookie(
         key=SESSION_COOKIE,
-        value=payload,
+        value=urlsafe_b64encode(sig + payload).decode("ascii"),
         httponly=True,
         secure=False,
         samesite="lax",
         max_age=SESSION_MAX_AGE,
         path="/",
     )
-    return sid
+
+@functools.lru_cache(maxsize=4096)
+def _decode_session(val: str) -> tuple[int | None, int | None, int]:
+    # Verified once per distinct cookie string; later requests with the same cookie are a dict hit
+    try:
+        raw = urlsafe_b64decode(val.encode("ascii"))
+        sig, payload = raw[:32], raw[32:]
+        if not hmac.compare_digest(sig, hmac.new(_SESSION_KEY, payload, hashlib.sha256).digest()):
+            return None, None, 0
+        d = orjson.loads(payload)
+        return int(d["u"]), (int(d["a"]) or None), int(d["exp"])
+    except Exception:
+        return None, None, 0
 
 def _parse_session(val: str | None) -> tuple[int | None, int | None]:
     # returns (user_id, account_id) or (None, None)
     if not val:
         return None, None
-    try:
-        parts = val.split("|")
-        if len(parts) < 3:
-            return None, None
-        uid = int(parts[1])
-        acct = int(parts[2])
-        if acct == 0:
-            acct = None
-        return uid, acct
-    except Exception:
+    uid, acct, exp = _decode_session(val)
+    if uid is None or exp < time.time():
         return None, None
+    return uid, acct
+
+# Config-derived values resolved once per process (config is not reloaded at runtime)
+@functools.lru_cache(maxsize=1)
+def _node_base_url() -> str:
+    cfg = get_config()
+    return f"http://{cfg.get('network.rpc_host','127.0.0.1')}:{cfg.get('network.rpc_port',28445)}"
+
+
+@functools.lru_cache(maxsize=1)
+def _kdf_params() -> tuple[int, int, int]:
+    cfg = get_config()
+    return int(cfg.get("wallet.kdf.t", 2)), int(cfg.get("wallet.kdf.m_kib", 65536)), int(cfg.get("wallet.kdf.p", 1))
+
+
+def _derive_wallet_key(passphrase: str, salt: bytes) -> bytes:
+    # Argon2id as a KDF: raw 32-byte output. Cost parameters are independent of PH (login).
+    t, m_kib, p = _kdf_params()
+    return hash_secret_raw(
+        secret=passphrase.encode("utf-8"),
+        salt=salt,
+        time_cost=t,
+        memory_cost=m_kib,
+        parallelism=p,
+        hash_len=32,
+        type=Type.ID,
+    )
+
+
+def _get_aesgcm(passphrase: str, salt: bytes, cache: bool = True):
+    """AES-GCM cipher over the wallet's Argon2-derived key, served from a short-lived cache.
+    cache=False derives without touching the cache (e.g. sealing under a fresh salt that is never looked up again)."""
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    if not cache:
+        return AESGCM(_derive_wallet_key(passphrase, salt))
+    ck = hashlib.blake2b(passphrase.encode("utf-8") + salt, digest_size=16).digest()
+    nowm = time.monotonic()
+    with _KEY_CACHE_LOCK:
+        for k in [k for k, (_, exp) in _KEY_CACHE.items() if exp <= nowm]:
+            del _KEY_CACHE[k]
+        ent = _KEY_CACHE.get(ck)
+        if ent is not None:
+            _KEY_CACHE.move_to_end(ck)
+            return ent[0]
+    # KDF runs outside the lock; concurrent misses for the same key just race to insert
+    aesgcm = AESGCM(_derive_wallet_key(passphrase, salt))
+    with _KEY_CACHE_LOCK:
+        _KEY_CACHE[ck] = (aesgcm, nowm + _KEY_CACHE_TTL_S)
+        _KEY_CACHE.move_to_end(ck)
+        while len(_KEY_CACHE) > _KEY_CACHE_MAX:
+            _KEY_CACHE.popitem(last=False)
+    return aesgcm
+
+
+def _seal_mnemonic(passphrase: str, words: str) -> dict:
+    """Encrypt a mnemonic under a fresh salt/nonce; returns the WalletAccount enc_* columns, each b64-encoded once."""
+    salt = os.urandom(16)
+    nonce = os.urandom(12)
+    ct = _get_aesgcm(passphrase, salt, cache=False).encrypt(nonce, words.encode("utf-8"), None)
+    return {
+        "enc_mnemonic": b64encode(ct).decode("ascii"),
+        "enc_salt": b64encode(salt).decode("ascii"),
+        "enc_nonce": b64encode(nonce).decode("ascii"),
+    }
+
+
+def _wallet_keys(seed: bytes) -> tuple[bytes, bytes, str]:
+    # (pk_view, pk_spend, primary address) for a wallet seed
+    _, pk_spend = ed25519_keypair_from_seed(seed, ctx=b"smelly-spend")
+    _, pk_view = ed25519_keypair_from_seed(seed, ctx=b"smelly-view")
+    return pk_view, pk_spend, encode_address(pk_view, pk_spend)
+
+
+async def _in_crypto_pool(fn):
+    # Seed/KDF/keypair work runs on a small bounded pool: registration bursts queue there
+    # instead of occupying the request threadpool that light sync endpoints share
+    return await asyncio.get_running_loop().run_in_executor(app.state.crypto_pool, fn)
+
+
+def _primary_address(s, acct_id: int) -> str:
+    # (account_id, index_major, index_minor) is unique: a point lookup, address column only
+    return s.execute(
+        select(SubAddress.address).filter_by(account_id=acct_id, index_major=0, index_minor=0)
+    ).scalar() or ""
+
+
+def _primary_address_for(acct_id: int) -> str:
+    # The 0/0 subaddress never changes once created: serve repeat page loads from memory.
+    # Misses ("" = not created yet) are not cached; api_new_subaddress drops the entry anyway.
+    addr = _PRIMARY_ADDR_CACHE.get(acct_id)
+    if addr is None:
+        with get_db().session() as s:
+            addr = _primary_address(s, acct_id)
+        if addr:
+            _PRIMARY_ADDR_CACHE[acct_id] = addr
+    return addr
+
+
+def _load_primary_and_subs(s, acct_id: int):
+    """All subaddresses of an account as lean rows ordered by index, plus the primary (0/0) address."""
+    subs = s.execute(
+        select(SubAddress.address, SubAddress.index_major, SubAddress.index_minor, SubAddress.label)
+        .filter_by(account_id=acct_id)
+        .order_by(SubAddress.index_major, SubAddress.index_minor)
+    ).all()
+    # ordered by (major, minor), so 0/0 can only be the first row
+    primary = subs[0].address if subs and subs[0].index_major == 0 and subs[0].index_minor == 0 else ""
+    return primary, subs
+
 
 def _require_csrf(req: Request):
     token = req.headers.get(CSRF_HEADER)
@@ -133,68 +335,55 @@ class LoginRequest(BaseModel):
     password: str
 
 @app.post("/auth/register")
-def auth_register(req: RegisterRequest):
+async def auth_register(req: RegisterRequest):
     """
     Register a new user and automatically generate a default wallet account,
     then bind the session to that new account. This streamlines onboarding.
     """
-    from base64 import b64encode
-    from os import urandom
-    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
-    import hashlib
-
-    db = get_db()
-    with db.session() as s:
-        existing = s.query(User).filter_by(username=req.username).first()
-        if existing:
-            raise HTTPException(status_code=400, detail="Username already exists")
-
-        # Create user
-        pwd_hash = PH.hash(req.password)
-        u = User(username=req.username, password_hash=pwd_hash, created_ms=now_ms())
-        s.add(u)
-        s.flush()  # get u.id
-
-        # Auto-generate wallet (default "Main")
-        # Generate mnemonic/seed and keys
+    def _material():
+        # Password hash, mnemonic/seed and keys, mnemonic encrypted under an Argon2id-derived key
         words, seed = generate_seed(language="english")
-        sk_spend, pk_spend = ed25519_keypair_from_seed(seed, ctx=b"smelly-spend")
-        sk_view, pk_view = ed25519_keypair_from_seed(seed, ctx=b"smelly-view")
-        address = encode_address(pk_view, pk_spend)
-
-        # Encrypt mnemonic using Argon2id-derived key -> AES-GCM
-        salt = urandom(16)
-        phs = PH.hash(req.password + b64encode(salt).decode("utf-8"))
-        key = hashlib.sha256(phs.encode("utf-8")).digest()
-        aesgcm = AESGCM(key)
-        nonce = urandom(12)
-        ct = aesgcm.encrypt(nonce, words.encode("utf-8"), None)
-
-        wa = WalletAccount(
-            name="Main",
-            public_view_key=pk_view.hex(),
-            public_spend_key=pk_spend.hex(),
-            owner_user_id=u.id,
-            enc_mnemonic=b64encode(ct).decode("utf-8"),
-            enc_salt=b64encode(salt).decode("utf-8"),
-            enc_nonce=b64encode(nonce).decode("utf-8"),
-            created_ms=now_ms(),
-        )
-        s.add(wa)
-        s.flush()
+        return PH.hash(req.password), _wallet_keys(seed), _seal_mnemonic(req.password, words)
 
-        # Primary subaddress 0/0
-        sub = SubAddress(
-            account_id=wa.id, index_major=0, index_minor=0, address=address, label="Primary"
-        )
-        s.add(sub)
+    def _store():
+        db = get_db()
+        with db.session() as s:
+            existing = s.query(User).filter_by(username=req.username).first()
+            if existing:
+                raise HTTPException(status_code=400, detail="Username already exists")
+
+            # Create user
+            u = User(username=req.username, password_hash=pwd_hash, created_ms=now_ms())
+            s.add(u)
+            s.flush()  # get u.id
+
+            # Auto-generate wallet (default "Main")
+            wa = WalletAccount(
+                name="Main",
+                public_view_key=pk_view.hex(),
+                public_spend_key=pk_spend.hex(),
+                owner_user_id=u.id,
+                **sealed,
+                created_ms=now_ms(),
+            )
+            s.add(wa)
+            s.flush()
 
-        s.commit()
+            # Primary subaddress 0/0
+            sub = SubAddress(
+                account_id=wa.id, index_major=0, index_minor=0, address=address, label="Primary"
+            )
+            s.add(sub)
 
-        # Issue session bound to the new account
-        resp = JSONResponse({"ok": True, "account_id": wa.id, "address": address})
-        _issue_session(resp, user_id=u.id, account_id=wa.id)
-        return resp
+            s.commit()
+
+            # Issue session bound to the new account
+            resp = ORJSONResponse({"ok": True, "account_id": wa.id, "address": address})
+            _issue_session(resp, user_id=u.id, account_id=wa.id)
+            return resp
+
+    pwd_hash, (pk_view, pk_spend, address), sealed = await _in_crypto_pool(_material)
+    return await run_in_threadpool(_store)
 
 @app.post("/auth/login")
 def auth_login(req: LoginRequest):
@@ -207,7 +396,7 @@ def auth_login(req: LoginRequest):
             PH.verify(u.password_hash, req.password)
         except Exception:
             raise HTTPException(status_code=401, detail="Invalid credentials")
-        resp = JSONResponse({"ok": True})
+        resp = ORJSONResponse({"ok": True})
         _issue_session(resp, user_id=u.id, account_id=None)
         return resp
 
@@ -246,132 +435,110 @@ def api_list_accounts(request: Request):
         ).all()
         # Detect selected account to highlight in UI
         _, acct = _parse_session(request.cookies.get(SESSION_COOKIE))
-        return [{"id": r.id, "name": r.name, "created_ms": r.created_ms, "selected": (acct == r.id)} for r in rows]
+        # Response object returned directly: skips FastAPI's jsonable_encoder walk over plain dicts
+        return ORJSONResponse([{"id": r.id, "name": r.name, "created_ms": r.created_ms, "selected": (acct == r.id)} for r in rows])
 
 
 @app.post("/api/v1/wallet/create", response_model=None)
-def api_create_wallet(req: CreateWalletRequest, request: Request):
+async def api_create_wallet(req: CreateWalletRequest, request: Request):
     # Require auth; bind created wallet to session
     uid, _ = require_auth(request)
     if not req.passphrase or len(req.passphrase) < 4:
         raise HTTPException(status_code=400, detail="Passphrase required")
-    # Generate mnemonic/seed and keys
-    words, seed = generate_seed(language=req.language)
-    sk_spend, pk_spend = ed25519_keypair_from_seed(seed, ctx=b"smelly-spend")
-    sk_view, pk_view = ed25519_keypair_from_seed(seed, ctx=b"smelly-view")
-    address = encode_address(pk_view, pk_spend)
-
-    # Encrypt mnemonic using Argon2id->AES-GCM
-    from base64 import b64encode
-    from os import urandom
-    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
-    # Derive key with argon2 hash of passphrase+salt
-    salt = urandom(16)
-    # Use PH.hash to store password, but for KDF use a simple approach here by hashing passphrase+salt via argon2 and truncating.
-    # In production, use a proper KDF (scrypt/pbkdf2/argon2 low-level). For simplicity, reuse argon2 and take bytes from encoded.
-    phs = PH.hash(req.passphrase + b64encode(salt).decode("utf-8"))
-    # Reduce to 32 bytes key by hashing string
-    import hashlib
-    key = hashlib.sha256(phs.encode("utf-8")).digest()
-    aesgcm = AESGCM(key)
-    nonce = urandom(12)
-    ct = aesgcm.encrypt(nonce, words.encode("utf-8"), None)
 
-    db = get_db()
-    with db.session() as s:
-        wa = WalletAccount(
-            name=req.name,
-            public_view_key=pk_view.hex(),
-            public_spend_key=pk_spend.hex(),
-            owner_user_id=uid,
-            enc_mnemonic=b64encode(ct).decode("utf-8"),
-            enc_salt=b64encode(salt).decode("utf-8"),
-            enc_nonce=b64encode(nonce).decode("utf-8"),
-            created_ms=now_ms(),
-        )
-        s.add(wa)
-        s.flush()
-        sub = SubAddress(
-            account_id=wa.id, index_major=0, index_minor=0, address=address, label="Primary"
-        )
-        s.add(sub)
-        s.commit()
+    def _material():
+        # Generate mnemonic/seed and keys; encrypt mnemonic using Argon2id->AES-GCM
+        words, seed = generate_seed(language=req.language)
+        return _wallet_keys(seed), _seal_mnemonic(req.passphrase, words)
 
-        resp = JSONResponse({
-            "account_id": wa.id,
-            "address": address,
-            "created": True
-        })
-        _issue_session(resp, user_id=uid, account_id=wa.id)
-        return resp
+    def _store():
+        db = get_db()
+        with db.session() as s:
+            wa = WalletAccount(
+                name=req.name,
+                public_view_key=pk_view.hex(),
+                public_spend_key=pk_spend.hex(),
+                owner_user_id=uid,
+                **sealed,
+                created_ms=now_ms(),
+            )
+            s.add(wa)
+            s.flush()
+            sub = SubAddress(
+                account_id=wa.id, index_major=0, index_minor=0, address=address, label="Primary"
+            )
+            s.add(sub)
+            s.commit()
+
+            resp = ORJSONResponse({
+                "account_id": wa.id,
+                "address": address,
+                "created": True
+            })
+            _issue_session(resp, user_id=uid, account_id=wa.id)
+            return resp
+
+    (pk_view, pk_spend, address), sealed = await _in_crypto_pool(_material)
+    return await run_in_threadpool(_store)
 
 
 @app.post("/api/v1/wallet/restore", response_model=None)
-def api_restore_wallet(req: RestoreWalletRequest, request: Request):
+async def api_restore_wallet(req: RestoreWalletRequest, request: Request):
     uid, _ = require_auth(request)
     if not req.passphrase or len(req.passphrase) < 4:
         raise HTTPException(status_code=400, detail="Passphrase required")
-    from mnemonic import Mnemonic
-    mn = Mnemonic("english")
-    if not mn.check(req.mnemonic):
-        raise HTTPException(status_code=400, detail="Invalid mnemonic")
-    seed = mn.to_seed(req.mnemonic, passphrase="")
-    sk_spend, pk_spend = ed25519_keypair_from_seed(seed, ctx=b"smelly-spend")
-    sk_view, pk_view = ed25519_keypair_from_seed(seed, ctx=b"smelly-view")
-    address = encode_address(pk_view, pk_spend)
-
-    # Encrypt mnemonic
-    from base64 import b64encode
-    from os import urandom
-    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
-    import hashlib
-    salt = urandom(16)
-    phs = PH.hash(req.passphrase + b64encode(salt).decode("utf-8"))
-    key = hashlib.sha256(phs.encode("utf-8")).digest()
-    aesgcm = AESGCM(key)
-    nonce = urandom(12)
-    ct = aesgcm.encrypt(nonce, req.mnemonic.encode("utf-8"), None)
 
-    db = get_db()
-    with db.session() as s:
-        existing_sub = s.query(SubAddress).filter_by(address=address, index_major=0, index_minor=0).first()
-        if existing_sub:
-            # update ownership if not set
-            acc = s.get(WalletAccount, existing_sub.account_id)
-            if acc and (acc.owner_user_id is None or acc.owner_user_id == uid):
-                acc.owner_user_id = uid if acc.owner_user_id is None else acc.owner_user_id
-                s.commit()
-            resp = JSONResponse({
-                "account_id": existing_sub.account_id,
-                "address": address,
-                "restored": True,
-                "existing": True
-            })
-            _issue_session(resp, user_id=uid, account_id=existing_sub.account_id)
-            return resp
+    def _material():
+        from mnemonic import Mnemonic
+        mn = Mnemonic("english")
+        if not mn.check(req.mnemonic):
+            raise HTTPException(status_code=400, detail="Invalid mnemonic")
+        seed = mn.to_seed(req.mnemonic, passphrase="")
+        # Encrypt mnemonic
+        return _wallet_keys(seed), _seal_mnemonic(req.passphrase, req.mnemonic)
 
-        wa = WalletAccount(
-            name=req.name,
-            public_view_key=pk_view.hex(),
-            public_spend_key=pk_spend.hex(),
-            owner_user_id=uid,
-            enc_mnemonic=b64encode(ct).decode("utf-8"),
-            enc_salt=b64encode(salt).decode("utf-8"),
-            enc_nonce=b64encode(nonce).decode("utf-8"),
-            created_ms=now_ms(),
-        )
-        s.add(wa)
-        s.flush()
+    def _store():
+        db = get_db()
+        with db.session() as s:
+            existing_sub = s.query(SubAddress).filter_by(address=address, index_major=0, index_minor=0).first()
+            if existing_sub:
+                # update ownership if not set
+                acc = s.get(WalletAccount, existing_sub.account_id)
+                if acc and (acc.owner_user_id is None or acc.owner_user_id == uid):
+                    acc.owner_user_id = uid if acc.owner_user_id is None else acc.owner_user_id
+                    s.commit()
+                resp = ORJSONResponse({
+                    "account_id": existing_sub.account_id,
+                    "address": address,
+                    "restored": True,
+                    "existing": True
+                })
+                _issue_session(resp, user_id=uid, account_id=existing_sub.account_id)
+                return resp
+
+            wa = WalletAccount(
+                name=req.name,
+                public_view_key=pk_view.hex(),
+                public_spend_key=pk_spend.hex(),
+                owner_user_id=uid,
+                **sealed,
+                created_ms=now_ms(),
+            )
+            s.add(wa)
+            s.flush()
 
-        sub = SubAddress(
-            account_id=wa.id, index_major=0, index_minor=0, address=address, label="Primary"
-        )
-        s.add(sub)
-        s.commit()
+            sub = SubAddress(
+                account_id=wa.id, index_major=0, index_minor=0, address=address, label="Primary"
+            )
+            s.add(sub)
+            s.commit()
 
-        resp = JSONResponse({"account_id": wa.id, "address": address, "restored": True, "existing": False})
-        _issue_session(resp, user_id=uid, account_id=wa.id)
-        return resp
+            resp = ORJSONResponse({"account_id": wa.id, "address": address, "restored": True, "existing": False})
+            _issue_session(resp, user_id=uid, account_id=wa.id)
+            return resp
+
+    (pk_view, pk_spend, address), sealed = await _in_crypto_pool(_material)
+    return await run_in_threadpool(_store)
 
 
 @app.get("/api/v1/session")
@@ -379,10 +546,7 @@ def api_session(request: Request):
     uid, acct = require_auth(request)
     primary_addr = ""
     if acct:
-        db = get_db()
-        with db.session() as s:
-            sub = s.query(SubAddress).filter_by(account_id=acct, index_major=0, index_minor=0).first()
-            primary_addr = sub.address if sub else ""
+        primary_addr = _primary_address_for(acct)
     return {"user_id": uid, "account_id": acct, "primary_address": primary_addr}
 
 
@@ -399,7 +563,7 @@ def api_select_wallet(req: SelectWalletRequest, request: Request):
             raise HTTPException(status_code=404, detail="Wallet not found")
         if acc.owner_user_id not in (None, uid):
             raise HTTPException(status_code=403, detail="Not your wallet")
-        resp = JSONResponse({"ok": True, "account_id": acc.id})
+        resp = ORJSONResponse({"ok": True, "account_id": acc.id})
         _issue_session(resp, user_id=uid, account_id=acc.id)
         return resp
 
@@ -413,15 +577,13 @@ def api_list_subaddresses(account_id: int, request: Request):
             raise HTTPException(status_code=404, detail="Account not found")
         if acc.owner_user_id not in (None, uid):
             raise HTTPException(status_code=403, detail="Forbidden")
-    db = get_db()
-    with db.session() as s:
         subs = (
             s.query(SubAddress)
             .filter_by(account_id=account_id)
             .order_by(SubAddress.index_major, SubAddress.index_minor)
             .all()
         )
-        return [
+        return ORJSONResponse([
             {
                 "id": sub.id,
                 "major": sub.index_major,
@@ -430,7 +592,7 @@ def api_list_subaddresses(account_id: int, request: Request):
                 "label": sub.label or "",
             }
             for sub in subs
-        ]
+        ])
 
 
 @app.post("/api/v1/subaddress/new")
@@ -454,6 +616,7 @@ def api_new_subaddress(req: NewSubAddressRequest, request: Request):
         )
         s.add(sub)
         s.commit()
+        _PRIMARY_ADDR_CACHE.pop(req.account_id, None)
         return {"id": sub.id, "address": addr}
 
 
@@ -462,20 +625,24 @@ def api_get_balance(address: str, request: Request):
     require_auth(request)
     db = get_db()
     with db.session() as s:
-        utxos = s.query(UTXO).filter_by(address=address, spent=False).order_by(UTXO.amount.asc()).all()
-        rewards = s.query(Reward).filter_by(miner_address=address).all()
-        bal = sum(u.amount for u in utxos)
-        rtotal = sum(r.amount for r in rewards)
+        # Aggregates in SQL; the UTXO list comes back as plain rows, not ORM objects
+        bal, smallest, largest, count = s.query(
+            func.coalesce(func.sum(UTXO.amount), 0.0), func.min(UTXO.amount), func.max(UTXO.amount), func.count(UTXO.id)
+        ).filter_by(address=address, spent=False).one()
+        rtotal = s.query(func.coalesce(func.sum(Reward.amount), 0.0)).filter_by(miner_address=address).scalar()
+        rows = s.execute(
+            select(UTXO.txid, UTXO.vout, UTXO.amount, UTXO.coinbase)
+            .filter_by(address=address, spent=False)
+            .order_by(UTXO.amount.asc())
+        ).all()
         # Provide spendability hints: smallest UTXO, largest UTXO, and simple coin-split suggestion threshold
-        smallest = utxos[0].amount if utxos else 0.0
-        largest = utxos[-1].amount if utxos else 0.0
-        return {
+        return ORJSONResponse({
             "address": address,
             "balance": bal,
             "rewards_total": rtotal,
-            "utxos": [{"txid": u.txid, "vout": u.vout, "amount": u.amount, "coinbase": u.coinbase} for u in utxos],
-            "utxo_stats": {"count": len(utxos), "smallest": smallest, "largest": largest}
-        }
+            "utxos": [{"txid": txid, "vout": vout, "amount": amount, "coinbase": cb} for txid, vout, amount, cb in rows],
+            "utxo_stats": {"count": count, "smallest": smallest or 0.0, "largest": largest or 0.0}
+        })
 
 # New: simple diagnostics for mempool skip counts (insufficient funds/invalid)
 @app.get("/api/v1/address/{address}/reasons")
@@ -510,59 +677,55 @@ def api_mempool(addr: str | None = None):
     # auth optional for read
     db = get_db()
     with db.session() as s:
-        q = s.query(MempoolTx).order_by(MempoolTx.fee.desc(), MempoolTx.added_ms.desc())
+        # plain column rows: no ORM instances / identity map for up to 500 entries
+        stmt = select(
+            MempoolTx.txid, MempoolTx.from_addr, MempoolTx.to_addr, MempoolTx.amount, MempoolTx.fee, MempoolTx.added_ms
+        ).order_by(MempoolTx.fee.desc(), MempoolTx.added_ms.desc())
         if addr:
-            q = q.filter((MempoolTx.from_addr == addr) | (MempoolTx.to_addr == addr))
-        rows = q.limit(500).all()
-        return [{
-            "txid": m.txid,
-            "from_addr": m.from_addr,
-            "to_addr": m.to_addr,
-            "amount": m.amount,
-            "fee": m.fee,
-            "added_ms": m.added_ms
-        } for m in rows]
+            stmt = stmt.where((MempoolTx.from_addr == addr) | (MempoolTx.to_addr == addr))
+        return ORJSONResponse([{
+            "txid": txid,
+            "from_addr": from_addr,
+            "to_addr": to_addr,
+            "amount": amount,
+            "fee": fee,
+            "added_ms": added_ms
+        } for txid, from_addr, to_addr, amount, fee, added_ms in s.execute(stmt.limit(500))])
 
 # ----- Node RPC proxy + height helper -----
 @app.get("/api/v1/node/height")
-def api_node_height():
-    cfg = get_config()
-    node_url = f"http://{cfg.get('network.rpc_host','127.0.0.1')}:{cfg.get('network.rpc_port',28445)}"
+async def api_node_height():
+    # Pure forwarders run on the event loop (AsyncClient) instead of holding a threadpool worker
     try:
-        r = httpx.get(f"{node_url}/rpc/get_height", timeout=5.0)
+        r = await app.state.node_http.get("/rpc/get_height", timeout=5.0)
         r.raise_for_status()
-        j = r.json()
+        j = orjson.loads(r.content)
         return {"height": j.get("height", -1)}
     except Exception as e:
         return {"height": -1, "error": str(e)}
 
 @app.api_route("/rpc/{path:path}", methods=["GET","POST"])
-def proxy_rpc(path: str, request: Request):
+async def proxy_rpc(path: str, request: Request):
     """
     Simple proxy so wallet UI can call /rpc/* against this server and hit Node RPC.
     """
-    cfg = get_config()
-    node_base = f"http://{cfg.get('network.rpc_host','127.0.0.1')}:{cfg.get('network.rpc_port',28445)}"
-    target = f"{node_base}/rpc/{path}"
+    node_http = app.state.node_http
+    target = f"/rpc/{path}"
     try:
         if request.method == "GET":
-            r = httpx.get(target, params=dict(request.query_params), timeout=10.0)
+            r = await node_http.get(target, params=dict(request.query_params), timeout=10.0)
         else:
-            body = {}
-            try:
-                body = httpx.Request("", "").json()  # placeholder
-            except Exception:
-                pass
-            # try read request body
-            try:
-                body = request.json()
-            except Exception:
-                try:
-                    body = request._body if hasattr(request, "_body") else {}
-                except Exception:
-                    body = {}
-            r = httpx.post(target, json=body if isinstance(body, dict) else None, timeout=20.0)
-        return JSONResponse(status_code=r.status_code, content=r.json() if r.headers.get("content-type","").startswith("application/json") else {"text": r.text})
+            # forward the body bytes untouched; no decode/re-encode, and empty bodies stay empty
+            r = await node_http.request(
+                request.method, target,
+                params=dict(request.query_params),
+                content=await request.body(),
+                headers={"content-type": request.headers.get("content-type", "application/json")},
+                timeout=20.0,
+            )
+        if r.headers.get("content-type", "").startswith("application/json"):
+            return Response(content=r.content, status_code=r.status_code, media_type="application/json")
+        return ORJSONResponse(status_code=r.status_code, content={"text": r.text})
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"RPC proxy error: {e}")
 
@@ -585,21 +748,25 @@ def api_export_mnemonic(req: ExportMnemonicRequest, request: Request):
             raise HTTPException(status_code=400, detail="Mnemonic not available")
 
         from base64 import b64decode
-        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
-        import hashlib, base64
         salt = b64decode(acc.enc_salt)
         nonce = b64decode(acc.enc_nonce)
         ct = b64decode(acc.enc_mnemonic)
         # Derive key like in creation
-        phs = PH.hash(req.passphrase + base64.b64encode(salt).decode("utf-8"))
-        key = hashlib.sha256(phs.encode("utf-8")).digest()
-        aesgcm = AESGCM(key)
+        aesgcm = _get_aesgcm(req.passphrase, salt)
         try:
             words = aesgcm.decrypt(nonce, ct, None).decode("utf-8")
         except Exception:
             raise HTTPException(status_code=401, detail="Invalid passphrase")
         return {"mnemonic": words}
 
+def _deduped_send(txid: str) -> dict:
+    return {
+        "txid": txid,
+        "status": "mempool",
+        "deduped": True,
+        "message": "Duplicate submit suppressed; existing mempool entry returned."
+    }
+
 @app.post("/api/v1/tx/send")
 def api_send(req: SendRequest, request: Request):
     _require_csrf(request)
@@ -607,38 +774,16 @@ def api_send(req: SendRequest, request: Request):
     db = get_db()
     id_key = req.dedupe_key()
     nowm = now_ms()
-    DEDUPE_WINDOW_MS = 30_000  # treat identical submits within 30s as duplicates
+    # Stable txid derived from id_key: txid is unique-indexed, so it doubles as the idempotency key
+    txid = hashlib.sha3_256(("SMELLY_TX|" + id_key).encode("utf-8")).hexdigest()
 
     with db.session() as s:
-        # Strong idempotency: look up any mempool row with exact id_key in raw within window
-        existing = (
-            s.query(MempoolTx)
-            .filter(MempoolTx.from_addr == req.from_address)
-            .filter(MempoolTx.to_addr == req.to_address)
-            .order_by(MempoolTx.added_ms.desc())
-            .first()
-        )
-        if existing and existing.raw and f"key={id_key}" in existing.raw:
-            # If recent, return same txid
-            try:
-                if existing.added_ms and (nowm - int(existing.added_ms)) <= DEDUPE_WINDOW_MS:
-                    return {
-                        "txid": existing.txid,
-                        "status": "mempool",
-                        "deduped": True,
-                        "message": "Duplicate submit suppressed; existing mempool entry returned."
-                    }
-            except Exception:
-                return {
-                    "txid": existing.txid,
-                    "status": "mempool",
-                    "deduped": True,
-                    "message": "Duplicate submit suppressed; existing mempool entry returned."
-                }
-
-        # Precheck: enforce spendability
-        utxos = s.query(UTXO).filter_by(address=req.from_address, spent=False).order_by(UTXO.amount.desc()).all()
-        avail = sum(u.amount for u in utxos)
+        # Strong idempotency: one index point lookup instead of scanning raw for key=
+        if s.query(MempoolTx.id).filter_by(txid=txid).first():
+            return _deduped_send(txid)
+
+        # Precheck: enforce spendability (aggregate over the (address, spent, amount) index)
+        avail = s.query(func.coalesce(func.sum(UTXO.amount), 0.0)).filter_by(address=req.from_address, spent=False).scalar() or 0.0
         amount = float(req.amount)
         fee = float(req.fee)
         need = amount + fee
@@ -647,21 +792,8 @@ def api_send(req: SendRequest, request: Request):
         if fee > 100.0:
             raise HTTPException(status_code=400, detail="Fee exceeds 100 SMELLY limit")
 
-        # Enqueue mempool tx with embedded idempotency key; also enforce unique(txid) and unique key-in-raw
+        # Enqueue mempool tx with embedded idempotency key
         raw = f"from={req.from_address};to={req.to_address};amount={amount};fee={fee};memo={req.memo or ''};key={id_key}"
-        # Re-check with exact raw in case concurrent double submit in same millisecond
-        existing2 = s.query(MempoolTx).filter(MempoolTx.raw == raw).first()
-        if existing2:
-            return {
-                "txid": existing2.txid,
-                "status": "mempool",
-                "deduped": True,
-                "message": "Duplicate submit suppressed; existing mempool entry returned."
-            }
-
-        # Generate a stable txid derived from id_key to be 100% idempotent
-        import hashlib as _hh
-        txid = _hh.sha3_256(("SMELLY_TX|" + id_key).encode("utf-8")).hexdigest()
 
         m = MempoolTx(
             txid=txid,
@@ -672,21 +804,14 @@ def api_send(req: SendRequest, request: Request):
             to_addr=req.to_address,
             amount=amount,
         )
-        # If same txid already present (race), return it
+        # Concurrent identical submit won the insert race: unique(txid) rejects ours
         try:
             s.add(m)
             s.commit()
-        except Exception:
+        except IntegrityError:
             s.rollback()
-            again = s.query(MempoolTx).filter_by(txid=txid).first()
-            if again:
-                return {
-                    "txid": again.txid,
-                    "status": "mempool",
-                    "deduped": True,
-                    "message": "Duplicate submit suppressed; existing mempool entry returned."
-                }
-            # If truly failed for other reason, re-raise
+            if s.query(MempoolTx.id).filter_by(txid=txid).first():
+                return _deduped_send(txid)
             raise
 
         return {
@@ -702,14 +827,48 @@ def api_send(req: SendRequest, request: Request):
 
 # ------------ Minimal UI entrypoints (multi-page to be added via templates) -------------
 
+def _htmlsafe_json(obj) -> str:
+    # orjson output made safe to embed in HTML with |safe, same escapes as Jinja's tojson/htmlsafe_json_dumps.
+    # These characters only ever occur inside JSON strings, where \uXXXX is equivalent.
+    return (
+        orjson.dumps(obj)
+        .replace(b"<", b"\\u003c")
+        .replace(b">", b"\\u003e")
+        .replace(b"&", b"\\u0026")
+        .replace(b"'", b"\\u0027")
+        .decode()
+    )
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+@functools.lru_cache(maxsize=1024)
+def _render_cached(name: str, ctx: tuple) -> tuple[str, bytes]:
+    # These pages depend only on (template, title, account); browsers fetch live data via the API
+    body = _JINJA_ENV.get_template(name).render(**dict(ctx)).encode("utf-8")
+    return _etag(body), body
+
+
+def _page_response(request: Request, etag: str, body: bytes) -> Response:
+    # Revalidate every time (auth/session may change) but answer unchanged pages with a bodiless 304
+    headers = {"etag": etag, "cache-control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="text/html", headers=headers)
+
+
+def _page(request: Request, name: str, **ctx) -> Response:
+    key = tuple(sorted(ctx.items()))
+    # SMELLY_DEV hot-reload: render fresh instead of serving a memoized body
+    etag, body = _render_cached.__wrapped__(name, key) if _JINJA_ENV.auto_reload else _render_cached(name, key)
+    return _page_response(request, etag, body)
+
+
 @app.get("/login", response_class=HTMLResponse)
 def login_page(request: Request):
-    from jinja2 import Environment, FileSystemLoader, select_autoescape
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    templates_dir = os.path.join(base_dir, "templates")
-    env = Environment(loader=FileSystemLoader(templates_dir), autoescape=select_autoescape(["html","xml"]))
-    tpl = env.get_template("login.html")
-    return HTMLResponse(tpl.render(title="Login - SMELLY Wallet"))
+    return _page(request, "login.html", title="Login - SMELLY Wallet")
 
 @app.get("/dashboard", response_class=HTMLResponse)
 def dashboard_page(request: Request):
@@ -720,22 +879,9 @@ def dashboard_page(request: Request):
     account_addr = ""
     account_id = acct
     if acct:
-        db = get_db()
-        with db.session() as s:
-            primary = (
-                s.query(SubAddress)
-                .filter_by(account_id=acct, index_major=0, index_minor=0)
-                .first()
-            )
-            if primary:
-                account_addr = primary.address
+        account_addr = _primary_address_for(acct)
     # render Jinja template
-    from jinja2 import Environment, FileSystemLoader, select_autoescape
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    templates_dir = os.path.join(base_dir, "templates")
-    env = Environment(loader=FileSystemLoader(templates_dir), autoescape=select_autoescape(["html","xml"]))
-    tpl = env.get_template("dashboard.html")
-    return HTMLResponse(tpl.render(title="Dashboard - SMELLY Wallet", account_id=account_id, account_address=account_addr))
+    return _page(request, "dashboard.html", title="Dashboard - SMELLY Wallet", account_id=account_id, account_address=account_addr)
 
 @app.get("/addresses", response_class=HTMLResponse)
 def addresses_page(request: Request):
@@ -745,21 +891,8 @@ def addresses_page(request: Request):
     account_addr = ""
     account_id = acct
     if acct:
-        db = get_db()
-        with db.session() as s:
-            primary = (
-                s.query(SubAddress)
-                .filter_by(account_id=acct, index_major=0, index_minor=0)
-                .first()
-            )
-            if primary:
-                account_addr = primary.address
-    from jinja2 import Environment, FileSystemLoader, select_autoescape
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    templates_dir = os.path.join(base_dir, "templates")
-    env = Environment(loader=FileSystemLoader(templates_dir), autoescape=select_autoescape(["html","xml"]))
-    tpl = env.get_template("addresses.html")
-    return HTMLResponse(tpl.render(title="Addresses - SMELLY Wallet", account_id=account_id, account_address=account_addr))
+        account_addr = _primary_address_for(acct)
+    return _page(request, "addresses.html", title="Addresses - SMELLY Wallet", account_id=account_id, account_address=account_addr)
 
 @app.get("/send", response_class=HTMLResponse)
 def send_page(request: Request):
@@ -769,38 +902,33 @@ def send_page(request: Request):
     account_addr = ""
     addresses: List[Dict[str, str | float]] = []
     if acct:
-        db = get_db()
-        with db.session() as s:
-            subs = (
-                s.query(SubAddress)
-                .filter_by(account_id=acct)
-                .order_by(SubAddress.index_major, SubAddress.index_minor)
-                .all()
-            )
-            # Deduplicate by address in case of accidental duplicates
-            seen = set()
-            deduped = []
-            for sub in subs:
-                if sub.address in seen:
-                    continue
-                seen.add(sub.address)
-                deduped.append(sub)
-            # fetch balances for each unique subaddress
-            for sub in deduped:
-                bal = s.query(UTXO).with_entities(func.coalesce(func.sum(UTXO.amount), 0.0)).filter_by(address=sub.address, spent=False).scalar() or 0.0  # type: ignore
-                addresses.append({"address": sub.address, "label": sub.label or f"{sub.index_major}/{sub.index_minor}", "balance": float(bal)})
+        with get_db().session() as s:
+            account_addr, subs = _load_primary_and_subs(s, acct)
+            # unspent balances for every subaddress via grouped queries (addresses are unique),
+            # batched to stay under SQLite's bound-parameter limit for large wallets
+            addrs = [addr for addr, _, _, _ in subs]
+            bals = {}
+            for i in range(0, len(addrs), _IN_BATCH):
+                bals.update(s.execute(
+                    select(UTXO.address, func.sum(UTXO.amount))
+                    .where(UTXO.address.in_(addrs[i:i + _IN_BATCH]))
+                    .filter_by(spent=False)
+                    .group_by(UTXO.address)
+                ).all())
+            addresses = [
+                {"address": addr, "label": label or f"{major}/{minor}", "balance": float(bals.get(addr) or 0.0)}
+                for addr, major, minor, label in subs
+            ]
             # default select primary if present
-            prim = next((a for a in addresses if a["label"] == "Primary"), None)
-            account_addr = prim["address"] if prim else (addresses[0]["address"] if addresses else "")
-    from jinja2 import Environment, FileSystemLoader, select_autoescape
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    templates_dir = os.path.join(base_dir, "templates")
-    env = Environment(loader=FileSystemLoader(templates_dir), autoescape=select_autoescape(["html","xml"]))
-    tpl = env.get_template("send.html")
+            if not account_addr and addresses:
+                account_addr = addresses[0]["address"]
+    # one orjson pass instead of a Jinja <option> loop
+    payload = _htmlsafe_json(addresses)
+    tpl = _JINJA_ENV.get_template("send.html")
     return HTMLResponse(tpl.render(
         title="Send - SMELLY Wallet",
         account_address=account_addr,
-        address_options=addresses
+        address_options_json=payload
     ))
 
 @app.get("/txs", response_class=HTMLResponse)
@@ -810,21 +938,8 @@ def txs_page(request: Request):
         return RedirectResponse(url="/login")
     account_addr = ""
     if acct:
-        db = get_db()
-        with db.session() as s:
-            primary = (
-                s.query(SubAddress)
-                .filter_by(account_id=acct, index_major=0, index_minor=0)
-                .first()
-            )
-            if primary:
-                account_addr = primary.address
-    from jinja2 import Environment, FileSystemLoader, select_autoescape
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    templates_dir = os.path.join(base_dir, "templates")
-    env = Environment(loader=FileSystemLoader(templates_dir), autoescape=select_autoescape(["html","xml"]))
-    tpl = env.get_template("txs.html")
-    return HTMLResponse(tpl.render(title="Transactions - SMELLY Wallet", account_address=account_addr))
+        account_addr = _primary_address_for(acct)
+    return _page(request, "txs.html", title="Transactions - SMELLY Wallet", account_address=account_addr)
 
 @app.get("/utxos", response_class=HTMLResponse)
 def utxos_page(request: Request):
@@ -833,45 +948,22 @@ def utxos_page(request: Request):
         return RedirectResponse(url="/login")
     account_addr = ""
     if acct:
-        db = get_db()
-        with db.session() as s:
-            primary = (
-                s.query(SubAddress)
-                .filter_by(account_id=acct, index_major=0, index_minor=0)
-                .first()
-            )
-            if primary:
-                account_addr = primary.address
-    from jinja2 import Environment, FileSystemLoader, select_autoescape
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    templates_dir = os.path.join(base_dir, "templates")
-    env = Environment(loader=FileSystemLoader(templates_dir), autoescape=select_autoescape(["html","xml"]))
-    tpl = env.get_template("utxos.html")
-    return HTMLResponse(tpl.render(title="UTXOs - SMELLY Wallet", account_address=account_addr))
+        account_addr = _primary_address_for(acct)
+    return _page(request, "utxos.html", title="UTXOs - SMELLY Wallet", account_address=account_addr)
 
 @app.get("/blocks", response_class=HTMLResponse)
 def blocks_page(request: Request):
     uid, acct = _parse_session(request.cookies.get(SESSION_COOKIE))
     if not uid:
         return RedirectResponse(url="/login")
-    from jinja2 import Environment, FileSystemLoader, select_autoescape
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    templates_dir = os.path.join(base_dir, "templates")
-    env = Environment(loader=FileSystemLoader(templates_dir), autoescape=select_autoescape(["html","xml"]))
-    tpl = env.get_template("blocks.html")
-    return HTMLResponse(tpl.render(title="Blocks - SMELLY Wallet"))
+    return _page(request, "blocks.html", title="Blocks - SMELLY Wallet")
 
 @app.get("/wallet", response_class=HTMLResponse)
 def wallet_mgmt_page(request: Request):
     uid, _ = _parse_session(request.cookies.get(SESSION_COOKIE))
     if not uid:
         return RedirectResponse(url="/login")
-    from jinja2 import Environment, FileSystemLoader, select_autoescape
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    templates_dir = os.path.join(base_dir, "templates")
-    env = Environment(loader=FileSystemLoader(templates_dir), autoescape=select_autoescape(["html","xml"]))
-    tpl = env.get_template("wallet.html")
-    return HTMLResponse(tpl.render(title="Wallet Management - SMELLY Wallet"))
+    return _page(request, "wallet.html", title="Wallet Management - SMELLY Wallet")
 
 # Keep legacy inline UI routes for compatibility until full templates are added
 
@@ -1165,17 +1257,24 @@ function walletApp() {
 </html>
 """
 
+# Constant page: UTF-8 encoded once instead of on every hit
+_WALLET_HTML_BYTES = WALLET_HTML.encode("utf-8")
+_WALLET_HTML_ETAG = _etag(_WALLET_HTML_BYTES)
+
 @app.get("/", response_class=HTMLResponse)
 def root_wallet_ui(request: Request):
     # Redirect to dashboard if authenticated, else to login
-    uid, _ = _parse_session(request.cookies.get(SESSION_COOKIE))
+    cookie = request.cookies.get(SESSION_COOKIE)
+    if not cookie:
+        return RedirectResponse(url="/login")
+    uid, _ = _parse_session(cookie)
     if uid:
         return RedirectResponse(url="/dashboard")
     return RedirectResponse(url="/login")
 
 @app.get("/wallet/ui", response_class=HTMLResponse)
-def wallet_ui():
-    return HTMLResponse(WALLET_HTML)
+def wallet_ui(request: Request):
+    return _page_response(request, _WALLET_HTML_ETAG, _WALLET_HTML_BYTES)
 
 
 # Back-compat simple endpoints (kept; prefer /api/v1/*)
@@ -1186,13 +1285,13 @@ def list_accounts():
 
 
 @app.post("/wallet/create")
-def create_wallet(req: CreateWalletRequest, request: Request):
-    return api_create_wallet(req, request)
+async def create_wallet(req: CreateWalletRequest, request: Request):
+    return await api_create_wallet(req, request)
 
 
 @app.post("/wallet/restore")
-def restore_wallet(req: RestoreWalletRequest, request: Request):
-    return api_restore_wallet(req, request)
+async def restore_wallet(req: RestoreWalletRequest, request: Request):
+    return await api_restore_wallet(req, request)
 
 
 @app.get("/wallet/{account_id}/subaddresses")
@@ -1210,11 +1309,27 @@ def get_balance(address: str):
     return api_get_balance(address)
 
 
+def _uvicorn_impls() -> tuple[str, str]:
+    # uvloop has no Windows build; fall back to asyncio/h11 wherever the fast paths are missing
+    import importlib.util
+    import sys
+    loop = "uvloop" if sys.platform != "win32" and importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    return loop, http
+
+
 def run_wallet_backend():
     cfg = get_config()
     host = cfg.get("network.rpc_host", "127.0.0.1")
     port = int(cfg.get("network.web_wallet_port", 28450))
-    uvicorn.run(app, host=host, port=port, log_level="info")
+    loop, http = _uvicorn_impls()
+    workers = int(cfg.get("wallet.workers", 1))
+    if workers > 1 and threading.current_thread() is threading.main_thread():
+        # multi-process needs an import string and signal handlers (main thread only, e.g. not tools/run.py)
+        uvicorn.run("apps.wallet.backend:app", host=host, port=port, log_level="info",
+                    loop=loop, http=http, workers=workers, access_log=False)
+        return
+    uvicorn.run(app, host=host, port=port, log_level="info", loop=loop, http=http, access_log=False)
 
 
 if __name__ == "__main__":
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import os
-from typing import List
+import threading
+import time
+from typing import Any, Callable, List
 
 from fastapi import FastAPI, Request, Form, HTTPException
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
 import uvicorn
 import requests
 
@@ -24,14 +26,33 @@ STATIC_DIR = os.path.join(BASE_DIR, "static")
 os.makedirs(TEMPLATES_DIR, exist_ok=True)
 os.makedirs(STATIC_DIR, exist_ok=True)
 
+# No per-request stat() of template files unless SMELLY_DEV is set (template hot-reload).
+# Bytecode goes to Jinja's default per-user cache dir (0700, ownership checked), never a shared temp path.
 env = Environment(
     loader=FileSystemLoader(TEMPLATES_DIR),
-    autoescape=select_autoescape(["html", "xml"])
+    autoescape=select_autoescape(["html", "xml"]),
+    bytecode_cache=FileSystemBytecodeCache(),
+    auto_reload=bool(os.environ.get("SMELLY_DEV")),
 )
 
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
 
+def _write_if_changed(path: str, text: str):
+    # Assets are constants: leave the file (and its mtime / page cache) alone when it already
+    # matches; otherwise replace atomically so concurrent workers never serve a partial file
+    try:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            if f.read() == text:
+                return
+    except OSError:
+        pass
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
 def write_default_assets():
     # CSS
     css = """
@@ -74,8 +95,7 @@ button {
 .table th, .table td { border-bottom: 1px solid #2a2a2a; padding: 8px; text-align: left; }
 .notice { color: #aaa; font-size: 12px; }
 """
-    with open(os.path.join(STATIC_DIR, "style.css"), "w", encoding="utf-8") as f:
-        f.write(css)
+    _write_if_changed(os.path.join(STATIC_DIR, "style.css"), css)
 
     # Templates
     index_html = """
@@ -157,8 +177,7 @@ button {
 </body>
 </html>
 """
-    with open(os.path.join(TEMPLATES_DIR, "index.html"), "w", encoding="utf-8") as f:
-        f.write(index_html)
+    _write_if_changed(os.path.join(TEMPLATES_DIR, "index.html"), index_html)
 
 
 @app.on_event("startup")
@@ -175,42 +194,72 @@ def wallet_backend_url() -> str:
     return f"http://{host}:{port}".rstrip("/")
 
 
+# Keep-alive connection pool to the wallet backend, shared by every backend_* call
+_HTTP = requests.Session()
+
+# Short-lived read cache for slow-changing backend lookups hit on every page view
+_READ_CACHE: dict[tuple, tuple[float, Any]] = {}
+_READ_CACHE_LOCK = threading.Lock()
+_READ_CACHE_TTL_S = 5.0
+_READ_CACHE_MAX = 1024
+
+
+def _cached_read(key: tuple, fetch: Callable[[], Any]) -> Any:
+    now = time.monotonic()
+    with _READ_CACHE_LOCK:
+        ent = _READ_CACHE.get(key)
+        if ent is not None and ent[0] > now:
+            return ent[1]
+    val = fetch()
+    with _READ_CACHE_LOCK:
+        if len(_READ_CACHE) >= _READ_CACHE_MAX:
+            _READ_CACHE.clear()
+        _READ_CACHE[key] = (now + _READ_CACHE_TTL_S, val)
+    return val
+
+
 def backend_get_accounts():
-    r = requests.get(f"{wallet_backend_url()}/wallet/accounts", timeout=5)
+    r = _HTTP.get(f"{wallet_backend_url()}/wallet/accounts", timeout=5)
     r.raise_for_status()
     return r.json()
 
 
 def backend_create_wallet(name: str, language: str):
-    r = requests.post(f"{wallet_backend_url()}/wallet/create", json={"name": name, "language": language}, timeout=20)
+    r = _HTTP.post(f"{wallet_backend_url()}/wallet/create", json={"name": name, "language": language}, timeout=20)
     r.raise_for_status()
     return r.json()
 
 
 def backend_restore_wallet(name: str, mnemonic: str):
-    r = requests.post(f"{wallet_backend_url()}/wallet/restore", json={"name": name, "mnemonic": mnemonic}, timeout=20)
+    r = _HTTP.post(f"{wallet_backend_url()}/wallet/restore", json={"name": name, "mnemonic": mnemonic}, timeout=20)
     r.raise_for_status()
     return r.json()
 
 
 def backend_list_subaddresses(account_id: int):
-    r = requests.get(f"{wallet_backend_url()}/wallet/{account_id}/subaddresses", timeout=10)
-    r.raise_for_status()
-    return r.json()
+    def fetch():
+        r = _HTTP.get(f"{wallet_backend_url()}/wallet/{account_id}/subaddresses", timeout=10)
+        r.raise_for_status()
+        return r.json()
+    return _cached_read(("subaddresses", account_id), fetch)
 
 
 def backend_new_subaddress(account_id: int, major: int, minor: int, label: str):
-    r = requests.post(f"{wallet_backend_url()}/wallet/new_subaddress", json={
+    r = _HTTP.post(f"{wallet_backend_url()}/wallet/new_subaddress", json={
         "account_id": account_id, "major": major, "minor": minor, "label": label
     }, timeout=10)
     r.raise_for_status()
+    with _READ_CACHE_LOCK:
+        _READ_CACHE.pop(("subaddresses", account_id), None)
     return r.json()
 
 
 def backend_balance(address: str):
-    r = requests.get(f"{wallet_backend_url()}/wallet/{address}/balance", timeout=5)
-    r.raise_for_status()
-    return r.json()
+    def fetch():
+        r = _HTTP.get(f"{wallet_backend_url()}/wallet/{address}/balance", timeout=5)
+        r.raise_for_status()
+        return r.json()
+    return _cached_read(("balance", address), fetch)
 
 
 @app.get("/", response_class=HTMLResponse)
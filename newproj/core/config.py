@@ -1,11 +1,103 @@
+import glob
+import hashlib
+import logging
+import marshal
 import os
+import tempfile
+import threading
 import yaml
 from typing import Any, Dict
 
+# libyaml-backed parser is several times faster than the pure-Python SafeLoader;
+# SMELLY_YAML_PURE=1 forces the pure loader for A/B timing or diagnosing parse differences
+_USE_C = os.environ.get("SMELLY_YAML_PURE") != "1"
+_Loader = yaml.CSafeLoader if (_USE_C and hasattr(yaml, "CSafeLoader")) else yaml.SafeLoader
+_loader_logged = False
+
+# Parsed-config cache (marshal of the YAML dict), keyed by config path + mtime + size. Lives in the
+# user's own cache dir (0700), never a shared temp dir: a snapshot is trusted as the config itself.
+_PARSE_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "smellycoin", "config"
+)
+
+
+def _owned_private(st: os.stat_result) -> bool:
+    # POSIX: ours and not writable by group/others (no uid ownership model to check on Windows)
+    if not hasattr(os, "getuid"):
+        return True
+    return st.st_uid == os.getuid() and not (st.st_mode & 0o022)
+
+
+def _parse_cache_dir() -> str | None:
+    try:
+        os.makedirs(_PARSE_CACHE_DIR, mode=0o700, exist_ok=True)
+        if _owned_private(os.stat(_PARSE_CACHE_DIR)):
+            return _PARSE_CACHE_DIR
+    except OSError:
+        pass
+    return None
+
+
+def _parse_cache_prefix(cache_dir: str, cfg_path: str) -> str:
+    tag = hashlib.blake2b(os.path.abspath(cfg_path).encode("utf-8"), digest_size=8).hexdigest()
+    # loader in the key: SMELLY_YAML_PURE runs must parse with the pure loader, not reuse a C-loader snapshot
+    return os.path.join(cache_dir, f"{tag}.{_Loader.__name__}.v{marshal.version}.")
+
+
+def _load_yaml_cached(cfg_path: str) -> Any:
+    st = os.stat(cfg_path)
+    cache_dir = _parse_cache_dir()
+    prefix = _parse_cache_prefix(cache_dir, cfg_path) if cache_dir else None
+    cache_path = f"{prefix}{st.st_mtime_ns}.{st.st_size}.marshal" if prefix else None
+    if cache_path:
+        try:
+            with open(cache_path, "rb") as f:
+                if _owned_private(os.fstat(f.fileno())):
+                    return marshal.loads(f.read())
+        except Exception:
+            pass
+    # raw bytes: libyaml detects/decodes UTF-8 itself, skipping the TextIOWrapper decode pass
+    with open(cfg_path, "rb") as f:
+        raw = f.read()
+    global _loader_logged
+    if not _loader_logged:
+        _loader_logged = True
+        logging.getLogger(__name__).debug("config YAML loader: %s", _Loader.__name__)
+    data = yaml.load(raw, Loader=_Loader)
+    if not cache_path:
+        return data
+    try:
+        blob = marshal.dumps(data)  # ValueError for YAML types marshal can't hold (dates etc.): skip caching
+        for stale in glob.glob(glob.escape(prefix) + "*.marshal"):
+            os.remove(stale)
+        fd, tmp = tempfile.mkstemp(dir=cache_dir)  # created 0600
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+        os.replace(tmp, cache_path)
+    except Exception:
+        pass
+    return data
+
+
+def _flatten(data: Dict[str, Any], prefix: str = "", out: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    """Map every dot path ('a', 'a.b', 'a.b.c') to its value, intermediate dicts included."""
+    if out is None:
+        out = {}
+    for k, v in data.items():
+        if not isinstance(k, str):
+            continue
+        path = prefix + k
+        out[path] = v
+        if isinstance(v, dict):
+            _flatten(v, path + ".", out)
+    return out
+
 
 class Config:
     def __init__(self, data: Dict[str, Any]):
         self.data = data
+        # data is not mutated after load, so every dot path is resolved once up front
+        self._flat = _flatten(data) if isinstance(data, dict) else {}
 
     @classmethod
     def load(cls, path: str = None) -> "Config":
@@ -13,28 +105,28 @@ class Config:
         Load YAML config. Defaults to configs/defaults.yaml, can be overridden with SMELLY_CONFIG env var.
         """
         cfg_path = path or os.environ.get("SMELLY_CONFIG") or os.path.join("configs", "defaults.yaml")
-        with open(cfg_path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
+        data = _load_yaml_cached(cfg_path) or {}
         return cls(data)
 
     def get(self, key_path: str, default=None):
         """
         Get nested config value via dot path, e.g. 'network.rpc_port'
         """
-        parts = key_path.split(".")
-        cur = self.data
-        for p in parts:
-            if not isinstance(cur, dict) or p not in cur:
-                return default
-            cur = cur[p]
-        return cur
+        return self._flat.get(key_path, default)
 
 
 _global_config: Config | None = None
+_config_lock = threading.Lock()
 
 
 def get_config() -> Config:
     global _global_config
-    if _global_config is None:
-        _global_config = Config.load()
-    return _global_config
+    cfg = _global_config
+    if cfg is None:
+        # double-checked so concurrent first callers parse the YAML only once
+        with _config_lock:
+            cfg = _global_config
+            if cfg is None:
+                cfg = Config.load()
+                _global_config = cfg
+    return cfg
@@ -10,7 +10,7 @@ from typing import List, Optional, Tuple, Dict, Any
 from core.db import get_db, BlockHeader, Transaction, UTXO, Reward, MempoolTx, KV, FairnessEpoch, FairnessCredit
 from sqlalchemy import func
 from core.config import get_config
-from core.utils import now_ms, sha3_256_hex as _sha3_256_hex
+from core.utils import now_ms, sha3_256_hex as _sha3_256_hex, sha3_256_level as _sha3_256_level
 from core.pow.randomx_stub import difficulty_to_target
 from core.pow.pow_backend import pow_hash, backend_name
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
@@ -69,19 +69,13 @@ class Header:
 
 
 def calc_merkle_root(txids: List[str]) -> str:
-    # Local helper hash that cannot be shadowed by imported names
-    def _h(b: bytes) -> str:
-        return _sha3_256_hex(b)
     if not txids:
-        return _h(b"")
+        return _sha3_256_hex(b"")
     layer = [bytes.fromhex(t) for t in txids]
     while len(layer) > 1:
-        nxt = []
         if len(layer) % 2 == 1:
             layer.append(layer[-1])
-        for i in range(0, len(layer), 2):
-            nxt.append(bytes.fromhex(_h(layer[i] + layer[i + 1])))
-        layer = nxt
+        layer = _sha3_256_level(layer)
     return layer[0].hex()
 
 
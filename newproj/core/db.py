@@ -109,13 +109,15 @@ class UTXO(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     txid = Column(String(64), nullable=False, index=True)
     vout = Column(Integer, nullable=False)
-    address = Column(String(255), nullable=False, index=True)
+    address = Column(String(255), nullable=False)  # served by the (address, spent, amount) prefix
     amount = Column(Float, nullable=False)
     spent = Column(Boolean, nullable=False, default=False)
     spent_txid = Column(String(64), nullable=True)
     coinbase = Column(Boolean, nullable=False, default=False)
     __table_args__ = (
         UniqueConstraint("txid", "vout", name="uq_tx_vout"),
+        # balance aggregates (sum/min/max over unspent, ordered by amount) stay index-only
+        Index("idx_utxo_addr_spent_amount", "address", "spent", "amount"),
     )
 
 
@@ -184,6 +186,10 @@ class MempoolTx(Base):
     from_addr = Column(String(255), nullable=True, index=True)
     to_addr = Column(String(255), nullable=True, index=True)
     amount = Column(Float, nullable=True)
+    __table_args__ = (
+        # wallet mempool listing orders by (fee, added_ms) DESC; walked backwards instead of sorted
+        Index("idx_mempool_fee_added", "fee", "added_ms"),
+    )
 
 
 # ===== Engine/Session utilities =====
@@ -281,6 +287,15 @@ class DB:
                 conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_credit_epoch_addr ON fairness_credit(epoch_id, miner_addr)")
             except Exception:
                 pass
+
+            # UTXO balance / mempool listing lookups (existing DBs created before the composite indexes)
+            try:
+                conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_utxo_addr_spent_amount ON utxos(address, spent, amount)")
+                conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_mempool_fee_added ON mempool(fee, added_ms)")
+                # single-column address index is a strict prefix of the composite; drop the extra write cost
+                conn.exec_driver_sql("DROP INDEX IF EXISTS ix_utxos_address")
+            except Exception:
+                pass
         # commit handled by context manager
 
     def session(self) -> Session:
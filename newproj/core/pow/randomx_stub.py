@@ -8,21 +8,26 @@ from typing import Tuple
 # For production, replace with native bindings to an audited RandomX implementation.
 # This stub mixes sha3_256 and memory-hardish loop to be CPU-friendly only for demo.
 
+_MASK64 = (1 << 64) - 1
+
 
 def _mix(data: bytes, rounds: int = 1000, mem_size: int = 1_000_000) -> bytes:
+    sha3 = hashlib.sha3_256
     buf = bytearray(mem_size)
-    seed = int.from_bytes(hashlib.sha3_256(data).digest(), "big")
+    seed = int.from_bytes(sha3(data).digest(), "big")
     idx = seed % mem_size
     val = seed
     for r in range(rounds):
-        val = (val * 6364136223846793005 + 1) & ((1 << 64) - 1)
+        val = (val * 6364136223846793005 + 1) & _MASK64
         idx = (idx + (val % 9973)) % mem_size
         buf[idx] = (buf[idx] + (val & 0xFF)) & 0xFF
         if r % 97 == 0:
             # occasional hashing to simulate latency
-            h = hashlib.sha3_256(bytes(buf[idx:idx+64])).digest()
+            h = sha3(buf[idx:idx+64]).digest()
             val ^= int.from_bytes(h, "big")
-    return hashlib.sha3_256(bytes(buf)).digest()
+    # Hash the bytearray in place: no copy, and hashlib drops the GIL for buffers this large,
+    # so concurrent miner threads overlap on the bulk of the work.
+    return sha3(buf).digest()
 
 
 def pow_hash(header_bytes: bytes, nonce: int) -> bytes:
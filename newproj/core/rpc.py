@@ -2,8 +2,11 @@ from __future__ import annotations
 
 from typing import Any, Dict, Optional, Tuple, List
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 import uvicorn
+import asyncio
+import threading
 import time
 import uuid
 import json
@@ -32,6 +35,19 @@ import socket
 # In-memory job cache for client-side mining (reset on restart)
 _WORK_JOBS: Dict[str, Dict[str, Any]] = {}
 _WORK_TTL_MS = 300_000  # 5 minutes
+# long_poll_work: tip re-check interval and the longest a caller may hold a request open
+_LONG_POLL_STEP_S = 0.25
+_LONG_POLL_MAX_S = 60.0
+# Set once uvicorn has started this app; in-process callers (the pool) use it to skip HTTP
+_SERVING = False
+# Tip hash shared by every long-poll waiter: (hash, monotonic read time); re-read from the DB at most
+# once per _LONG_POLL_STEP_S however many callers are parked. Block acceptance here invalidates it and
+# wakes waiters immediately (_tip_changed); blocks arriving by other paths are seen on the next re-read.
+_TIP_CACHE: Tuple[str, float] = ("", float("-inf"))
+_TIP_LOCK = threading.Lock()
+_TIP_COND = threading.Condition()  # in-process sync waiters (pool job thread)
+_TIP_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_TIP_EVENT: Optional[asyncio.Event] = None  # replaced on every wake; only touched on _TIP_LOOP
 
 # Ticket mining defaults (can be overridden via configs)
 _TICKET_WINDOW_MS = 4000
@@ -138,11 +154,12 @@ def on_startup():
     db = get_db()
     add_genesis_if_needed()
     cfg = get_config()
-    global _TICKET_WINDOW_MS, _NONCE_WINDOW_POW2, _NEAR_TARGET_RATE_PER_MIN
+    global _TICKET_WINDOW_MS, _NONCE_WINDOW_POW2, _NEAR_TARGET_RATE_PER_MIN, _SERVING
     _TICKET_WINDOW_MS = int(cfg.get("fairness.ticket_window_ms", 4000))
     _NONCE_WINDOW_POW2 = int(cfg.get("fairness.nonce_window_pow2", 21))
     _NEAR_TARGET_RATE_PER_MIN = int(cfg.get("fairness.target_near_rate_per_min", 3))
     _ensure_current_epoch()
+    _SERVING = True
     try:
         from core.pow.pow_backend import backend_name
         rpc_logger.info(
@@ -242,6 +259,7 @@ def rpc_mine_one(req: MineRequest):
         hh, err = append_block_header(req.miner_address)
         if err:
             return {"hash": None, "error": err}
+        _tip_changed()
         return {"hash": hh}
     except Exception as e:
         return {"hash": None, "error": str(e)}
@@ -340,6 +358,107 @@ def rpc_get_work(req: GetWorkRequest):
         raise HTTPException(status_code=500, detail=f"get_work failed: {e}")
 
 
+def is_serving() -> bool:
+    return _SERVING
+
+
+def _issue_work() -> Dict[str, Any]:
+    job = _build_work_snapshot(None)
+    _store_job(job)
+    return job
+
+
+def next_work(since: str = "", timeout_s: float = 0.0) -> Dict[str, Any]:
+    """
+    Wait (up to timeout_s) for the tip to move past `since`, then issue and store a fresh job.
+    Called directly by an in-process pool from its own thread; /rpc/long_poll_work uses next_work_async.
+    """
+    since = (since or "").strip().lower()
+    deadline = time.monotonic() + min(max(timeout_s, 0.0), _LONG_POLL_MAX_S)
+    while since and _tip_hash() == since:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        with _TIP_COND:
+            _TIP_COND.wait(min(_LONG_POLL_STEP_S, remaining))
+    return _issue_work()
+
+
+async def next_work_async(since: str = "", timeout_s: float = 0.0) -> Dict[str, Any]:
+    """next_work for the event loop: waiters hold no threadpool worker while parked."""
+    global _TIP_LOOP, _TIP_EVENT
+    if _TIP_EVENT is None:
+        _TIP_LOOP, _TIP_EVENT = asyncio.get_running_loop(), asyncio.Event()
+    since = (since or "").strip().lower()
+    deadline = time.monotonic() + min(max(timeout_s, 0.0), _LONG_POLL_MAX_S)
+    while since:
+        tip = _cached_tip_hash()
+        if tip is None:
+            tip = await run_in_threadpool(_tip_hash)
+        remaining = deadline - time.monotonic()
+        if tip != since or remaining <= 0:
+            break
+        try:
+            await asyncio.wait_for(_TIP_EVENT.wait(), min(_LONG_POLL_STEP_S, remaining))
+        except asyncio.TimeoutError:
+            pass
+    return await run_in_threadpool(_issue_work)
+
+
+def _cached_tip_hash() -> Optional[str]:
+    # None when the cached tip is older than one poll step
+    hh, at = _TIP_CACHE
+    return hh if time.monotonic() - at < _LONG_POLL_STEP_S else None
+
+
+def _tip_hash() -> str:
+    global _TIP_CACHE
+    hh = _cached_tip_hash()
+    if hh is not None:
+        return hh
+    with _TIP_LOCK:
+        hh = _cached_tip_hash()  # another thread may have refreshed it while we waited
+        if hh is not None:
+            return hh
+        with get_db().session() as s:
+            hh = s.query(BlockHeader.hash_hex).order_by(BlockHeader.height.desc()).limit(1).scalar()
+        hh = (hh or "").lower()
+        _TIP_CACHE = (hh, time.monotonic())
+    return hh
+
+
+def _wake_async_tip_waiters():
+    global _TIP_EVENT
+    ev, _TIP_EVENT = _TIP_EVENT, asyncio.Event()
+    ev.set()
+
+
+def _tip_changed():
+    """A block was accepted: drop the cached tip and wake every long-poll waiter."""
+    global _TIP_CACHE
+    _TIP_CACHE = ("", float("-inf"))
+    with _TIP_COND:
+        _TIP_COND.notify_all()
+    loop = _TIP_LOOP
+    if loop is not None:
+        try:
+            loop.call_soon_threadsafe(_wake_async_tip_waiters)
+        except RuntimeError:
+            pass  # loop closed
+
+
+@app.get("/rpc/long_poll_work")
+async def rpc_long_poll_work(since: str = "", timeout_s: float = 30.0):
+    """
+    Like get_work, but holds the request until the tip hash differs from `since`
+    or timeout_s elapses, then returns a fresh job either way.
+    """
+    try:
+        return await next_work_async(since, timeout_s)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"long_poll_work failed: {e}")
+
+
 @app.post("/rpc/submit_work")
 def rpc_submit_work(req: SubmitWorkRequest):
     """
@@ -439,6 +558,7 @@ def rpc_submit_work(req: SubmitWorkRequest):
         raise HTTPException(status_code=400, detail=detail)
 
     _WORK_JOBS.pop(req.job_id, None)
+    _tip_changed()
     rpc_logger.info(_Color.GREEN + f"submit_work: ACCEPTED h={height} hash={hh[:16]}.." + _Color.RESET)
     return {"accepted": True, "hash": hh, "height": height, "prev": prev_from_job, "job_id": req.job_id, "txids_len": len(txids_snapshot)}
 
@@ -876,6 +996,7 @@ def rpc_solo_submit_block(req: SoloSubmitBlock):
             rpc_logger.error(_Color.RED + "solo_submit_block: REJECT target not met." + _Color.RESET)
         rpc_logger.error("solo_submit_block reject %s", json.dumps(detail, separators=(",", ":"), sort_keys=True))
         raise HTTPException(status_code=400, detail=detail)
+    _tip_changed()
 
     try:
         with db.session() as s4:
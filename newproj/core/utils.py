@@ -4,7 +4,7 @@ import json
 import hashlib
 import base64
 import secrets
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 
 def now_ms() -> int:
@@ -20,6 +20,16 @@ def sha3_256_hex(data: bytes) -> str:
     return hashlib.sha3_256(data).hexdigest()
 
 
+def sha3_256_level(nodes: List[bytes]) -> List[bytes]:
+    # Parent digests of one merkle level (even length): sha3_256(left || right) per pair.
+    # Single batching point for merkle hashing; a native multi-lane Keccak can slot in here.
+    sha3 = hashlib.sha3_256
+    if any(len(x) != 32 for x in nodes):
+        return [sha3(nodes[i] + nodes[i + 1]).digest() for i in range(0, len(nodes), 2)]
+    buf = memoryview(b"".join(nodes))
+    return [sha3(buf[i:i + 64]).digest() for i in range(0, len(buf), 64)]
+
+
 def b64e(data: bytes) -> str:
     return base64.b64encode(data).decode("ascii")
 
@@ -231,8 +231,10 @@ def main():
         s.settimeout(5.0)
         s.connect(("127.0.0.1", A_P2P))
         fp = s.makefile(mode="rwb")
-        fp.write((json.dumps({"type": "VERSION", "time": int(time.time()*1000)}) + "\n").encode("utf-8")); fp.flush()
-        fp.write((json.dumps({"type": "VERACK"}) + "\n").encode("utf-8")); fp.flush()
+        # P2P frames: 4-byte big-endian length + JSON payload
+        for msg in ({"type": "VERSION", "time": int(time.time()*1000)}, {"type": "VERACK"}):
+            body = json.dumps(msg).encode("utf-8")
+            fp.write(len(body).to_bytes(4, "big") + body); fp.flush()
         # Keep connection open in background to allow announcements; don't block harness
     except Exception as e:
         print("[HARNESS] WARN: P2P connect B->A failed:", e)